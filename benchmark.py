@@ -0,0 +1,233 @@
+"""Benchmarks for the sizing engine.
+
+Runs run_calculations over a fixed grid of controllers, expansion subsets,
+point totals (10 up to each controller's max_point_capacity) and spare
+percentages, and records wall time, peak Python memory, candidate counts and
+the CalcStats stage/counter breakdown for every case in a JSON file. Point mixes are derived from the total with a
+fixed split, so the same grid is produced on every run.
+
+    python benchmark.py --quick                       # reduced grid, a few minutes
+    python benchmark.py -o results.json --save-baseline benchmark_baseline.json
+    python benchmark.py --compare benchmark_baseline.json
+
+With --compare, cases that got slower than --threshold (default 1.25x, and
+by at least --min-delta-ms) or whose candidate/result counts changed are
+listed and the exit code is 1.
+"""
+import argparse
+import itertools
+import json
+import math
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import core
+
+SPARES = [0, 10, 25]
+QUICK_SPARES = [0, 20]
+# Share of the total per point type. PRESSURE is only requested on controllers that have it.
+POINT_SPLIT = {"BO": 0.20, "BI": 0.20, "UI": 0.25, "AO": 0.15, "AI": 0.15, "PRESSURE": 0.05}
+
+
+def point_mix(total, controller):
+    """Split total into point types, with rounding remainders going to UI."""
+    split = dict(POINT_SPLIT)
+    if controller.PRESSURE == 0:
+        split["UI"] += split.pop("PRESSURE")
+    points = {key: int(total * share) for key, share in split.items()}
+    if "PRESSURE" in points:
+        points["PRESSURE"] = min(points["PRESSURE"], controller.PRESSURE)
+    points["UI"] += total - sum(points.values())
+    points.setdefault("PRESSURE", 0)
+    return points
+
+
+def point_totals(capacity, quick=False):
+    """10, then a 1-2-5 series (1-5 with quick) below capacity, then capacity itself."""
+    if capacity < 10:
+        return [capacity]
+    steps = (1, 5) if quick else (1, 2, 5)
+    totals = []
+    for decade in itertools.count(1):
+        for step in steps:
+            value = step * 10 ** decade
+            if value >= capacity:
+                return totals + [capacity]
+            totals.append(value)
+
+
+def expansion_subsets(controller, quick=False):
+    names = core.TRANE_EXPANSION_NAMES if controller.brand == "Trane" else core.TRIDIUM_EXPANSION_NAMES
+    subsets = [
+        list(combo)
+        for size in range(1, len(names) + 1)
+        for combo in itertools.combinations(names, size)
+    ]
+    return [subsets[-1]] if quick else subsets
+
+
+def lattice_size(system, expansions):
+    """Number of expansion-count combinations find_combinations enumerates."""
+    caps = system._max_by_expansion(system._required_total_points())
+    return math.prod(caps.get(exp.name, 0) + 1 for exp in expansions)
+
+
+def build_cases(controllers, quick=False):
+    cases = []
+    for controller_name in core.ALL_SYSTEM_CONTROLLER_NAMES:
+        controller = controllers[controller_name]
+        for names in expansion_subsets(controller, quick):
+            for spare in QUICK_SPARES if quick else SPARES:
+                # Capacity applies after spare, as in the GUI.
+                limit = int(controller.max_point_capacity / (1 + spare / 100))
+                for total in point_totals(limit, quick):
+                    cases.append({
+                        "id": f"{controller_name}|{'+'.join(names)}|{total}|{spare}",
+                        "controller": controller_name,
+                        "expansions": names,
+                        "total_points": total,
+                        "spare": spare,
+                    })
+    return cases
+
+
+def run_case(case, controllers, repeats, max_candidates, engine="auto"):
+    controller = controllers[case["controller"]]
+    expansions = [controllers[name] for name in case["expansions"]]
+    base = point_mix(case["total_points"], controller)
+    points = {key: math.ceil(value * (1 + case["spare"] / 100)) for key, value in base.items()}
+    # Spare must not push pressure past what the controller has, or every case is infeasible.
+    points["PRESSURE"] = min(points["PRESSURE"], controller.PRESSURE)
+    system = core.System(points, controller, expansions, controllers["PM014"], controller.brand == "Trane")
+    candidates = lattice_size(system, expansions)
+    record = dict(case, points=points, candidates=candidates)
+    if candidates > max_candidates:
+        record["skipped"] = f"more than {max_candidates} candidates"
+        return record
+
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        results = core.run_calculations(
+            points, controller, expansions, controllers["PM014"], controller.brand == "Trane", engine=engine
+        )
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    core.run_calculations(points, controller, expansions, controllers["PM014"], controller.brand == "Trane", engine=engine)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    _, stats = core.run_calculations(
+        points, controller, expansions, controllers["PM014"], controller.brand == "Trane",
+        with_stats=True, engine=engine,
+    )
+
+    record.update(
+        results=len(results),
+        best_price=float(results["Price"].iloc[0]) if len(results) else None,
+        time_s={"min": min(times), "median": statistics.median(times)},
+        peak_kib=round(peak / 1024, 1),
+        stages_s=dict(stats.stages),
+        counters=dict(stats.counters),
+        engine_used=stats.engine or engine,
+    )
+    return record
+
+
+def environment():
+    import numpy
+    import pandas
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "pandas": pandas.__version__,
+        "numpy": numpy.__version__,
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def compare(results, baseline, threshold, min_delta_s=0.0):
+    """Return (regressions, changes, speedups) lines for cases present in both runs."""
+    previous = {case["id"]: case for case in baseline["cases"]}
+    regressions, changes, speedups = [], [], []
+    for case in results["cases"]:
+        old = previous.get(case["id"])
+        if old is None or "skipped" in case or "skipped" in old:
+            continue
+        for key in ("candidates", "results", "best_price"):
+            if case.get(key) != old.get(key):
+                changes.append(f"{case['id']}: {key} {old.get(key)} -> {case.get(key)}")
+        new_time, old_time = case["time_s"]["min"], old["time_s"]["min"]
+        if abs(new_time - old_time) < min_delta_s:
+            continue
+        ratio = new_time / max(old_time, 1e-9)
+        line = f"{case['id']}: {old['time_s']['min'] * 1000:.2f} ms -> {case['time_s']['min'] * 1000:.2f} ms ({ratio:.2f}x)"
+        if ratio > threshold:
+            regressions.append(line)
+        elif ratio < 1 / threshold:
+            speedups.append(line)
+    return regressions, changes, speedups
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="benchmark.py", description="Benchmark the sizing engine.")
+    parser.add_argument("-o", "--output", default="benchmark_results.json", help="results file (default: %(default)s)")
+    parser.add_argument("--quick", action="store_true", help="largest expansion subset only, fewer totals and spares")
+    parser.add_argument("--repeats", type=int, default=3, help="timed runs per case; the minimum is compared (default: 3)")
+    parser.add_argument("--max-candidates", type=int, default=2_000_000, help="skip cases with a larger lattice")
+    parser.add_argument("--filter", help="only run cases whose id contains this text, e.g. 'S800' or '|500|'")
+    parser.add_argument("--engine", default="auto", choices=list(core.ENGINES), help="solve engine (default: auto)")
+    parser.add_argument("--compare", metavar="BASELINE", help="compare with a previous results file")
+    parser.add_argument("--threshold", type=float, default=1.25, help="slowdown ratio reported as a regression")
+    parser.add_argument("--min-delta-ms", type=float, default=2.0, help="ignore timing changes smaller than this (default: 2)")
+    parser.add_argument("--save-baseline", metavar="PATH", help="also write the results to PATH")
+    args = parser.parse_args(argv)
+
+    controllers = core.default_controllers()
+    cases = build_cases(controllers, args.quick)
+    if args.filter:
+        cases = [case for case in cases if args.filter in case["id"]]
+
+    # Import pandas and warm up caches before timing anything.
+    core.run_calculations({"BO": 1}, controllers["S500"], [controllers["XM30"]], controllers["PM014"], True)
+
+    records = []
+    started = time.perf_counter()
+    for index, case in enumerate(cases, 1):
+        record = run_case(case, controllers, args.repeats, args.max_candidates, args.engine)
+        records.append(record)
+        timing = record["skipped"] if "skipped" in record else f"{record['time_s']['min'] * 1000:9.2f} ms"
+        print(f"[{index}/{len(cases)}] {case['id']:<40} {record['candidates']:>9} candidates  {timing}", file=sys.stderr)
+
+    results = {
+        "environment": environment(),
+        "engine": args.engine,
+        "total_time_s": round(time.perf_counter() - started, 3),
+        "cases": records,
+    }
+    for path in filter(None, [args.output, args.save_baseline]):
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(results, handle, indent=1)
+
+    if not args.compare:
+        return 0
+    with open(args.compare, encoding="utf-8") as handle:
+        baseline = json.load(handle)
+    regressions, changes, speedups = compare(results, baseline, args.threshold, args.min_delta_ms / 1000)
+    for title, lines in (("Slower", regressions), ("Output changed", changes), ("Faster", speedups)):
+        if lines:
+            print(f"\n{title} ({len(lines)}):")
+            for line in lines:
+                print(f"  {line}")
+    print(f"\n{len(regressions)} slower, {len(speedups)} faster, {len(changes)} output changes "
+          f"(threshold {args.threshold:.2f}x)")
+    return 1 if regressions or changes else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
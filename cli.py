@@ -0,0 +1,194 @@
+"""Headless batch runner for the sizing engine.
+
+Reads a systems CSV/XLSX in the Multiple Systems template layout and streams
+the cheapest combination for every system to CSV or JSON Lines:
+
+    python cli.py takeoff.xlsx --controller S500 --spare 10 --workers 4 -o results.csv
+    python cli.py takeoff.csv --controller JACE9010 --format jsonl > results.jsonl
+    python cli.py takeoff.xlsx --controller S800 --sweep 0,10,15,20,25   # building cost per spare %
+"""
+import argparse
+import csv
+import json
+import logging
+import math
+import os
+import sys
+
+import core
+from ingest import POINT_COLUMNS, IngestError, read_systems_file
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="cli.py",
+        description="Size controllers and expansions for every system in a takeoff file.",
+    )
+    parser.add_argument("input", help="systems file (.csv or .xlsx) in the template layout")
+    parser.add_argument("-c", "--controller", default="S500", choices=core.ALL_SYSTEM_CONTROLLER_NAMES)
+    parser.add_argument(
+        "-e", "--expansions",
+        help="comma-separated expansions to allow (default: the GUI defaults for the controller's brand)",
+    )
+    parser.add_argument("--no-pm014", action="store_true", help="do not add PM014 power modules (Trane only)")
+    parser.add_argument("-s", "--spare", type=int, default=0, help="spare points percentage (default: 0)")
+    parser.add_argument(
+        "--sweep", type=parse_spares, metavar="PCTS",
+        help="comma-separated spare percentages; write one building total per spare instead of per-system rows",
+    )
+    parser.add_argument("--trane-multiplier", type=float, default=1.0)
+    parser.add_argument("--tridium-multiplier", type=float, default=1.0)
+    parser.add_argument("-w", "--workers", type=int, default=1, help="worker processes, 0 for one per CPU (default: 1)")
+    parser.add_argument("-f", "--format", choices=["csv", "jsonl"], default="csv")
+    parser.add_argument("-o", "--output", help="output file (default: stdout)")
+    parser.add_argument("--no-total", action="store_true", help="omit the trailing Total row")
+    parser.add_argument(
+        "--cache", nargs="?", const="", metavar="PATH",
+        help="reuse results from the on-disk cache (default location, or PATH) and store new ones",
+    )
+    parser.add_argument(
+        "--live-prices", action="store_true",
+        help="fetch list prices from the repository instead of using the embedded catalog",
+    )
+    parser.add_argument(
+        "--engine", choices=list(core.ENGINES),
+        help="force this solve engine for every system (debugging; default: chosen per system)",
+    )
+    parser.add_argument("-v", "--verbose", action="store_true", help="log which engine solved each system and why")
+    return parser
+
+
+def parse_spares(text):
+    try:
+        spares = [int(part) for part in text.split(",") if part.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected comma-separated integers, got {text!r}")
+    if not spares or min(spares) < 0:
+        raise argparse.ArgumentTypeError("spare percentages must be 0 or more")
+    return spares
+
+
+class RowWriter:
+    """Write result rows as CSV or JSON Lines, one row at a time."""
+
+    def __init__(self, handle, fmt, columns):
+        self.handle = handle
+        self.fmt = fmt
+        self.columns = columns
+        if fmt == "csv":
+            self._csv = csv.writer(handle)
+            self._csv.writerow(columns)
+
+    def write(self, row):
+        if self.fmt == "csv":
+            self._csv.writerow(row)
+        else:
+            self.handle.write(json.dumps(dict(zip(self.columns, row))) + "\n")
+        self.handle.flush()
+
+
+def run(args, stdout=sys.stdout, stderr=sys.stderr):
+    controllers = core.default_controllers()
+    if args.live_prices:
+        core.apply_prices(controllers, core.fetch_prices(core.PRICES_URL))
+        if core.PRICES_FALLBACK_USED:
+            print(f"warning: live prices unavailable, using embedded list prices ({core.PRICES_FETCH_ERROR})", file=stderr)
+
+    if args.cache is not None:
+        core.enable_result_cache(args.cache or None).set_catalog(controllers)
+
+    if args.trane_multiplier <= 0 or args.tridium_multiplier <= 0:
+        print("error: both brand multipliers must be greater than 0", file=stderr)
+        return 2
+    controller = controllers[args.controller]
+    try:
+        expansions = core.resolve_expansions(controllers, controller, args.expansions)
+        systems = read_systems_file(args.input)
+    except (ValueError, OSError) as e:
+        label = f"could not load {args.input}" if isinstance(e, IngestError) else "error"
+        print(f"{label}: {e}", file=stderr)
+        return 2
+
+    include_pm014 = controller.brand == "Trane" and not args.no_pm014
+    if args.sweep:
+        return write_sweep(args, systems, controller, expansions, controllers["PM014"], include_pm014, stdout)
+
+    # Same capacity check as the GUI, done up front for the whole batch.
+    factor = 1 + args.spare / 100
+    totals = systems[POINT_COLUMNS].apply(lambda col: col.map(lambda x: math.ceil(x * factor))).sum(axis=1)
+    exceeded = systems.loc[totals > controller.max_point_capacity, "System"].tolist()
+    if exceeded:
+        print(
+            f"error: these systems exceed {controller.name}'s capacity of {controller.max_point_capacity} points: "
+            + ", ".join(map(str, exceeded)),
+            file=stderr,
+        )
+        return 2
+
+    columns = ["System Name"] + core.EXPECTED_COLUMNS
+    handle = open(args.output, "w", newline="", encoding="utf-8") if args.output else stdout
+    try:
+        writer = RowWriter(handle, args.format, columns)
+        totals_row = [0] * len(core.EXPECTED_COLUMNS)
+        for row in core.iter_building_calculations(
+            systems,
+            controller,
+            expansions,
+            controllers["PM014"],
+            include_pm014,
+            args.spare,
+            trane_multiplier=args.trane_multiplier,
+            tridium_multiplier=args.tridium_multiplier,
+            workers=args.workers,
+        ):
+            writer.write(row)
+            totals_row = [a + b for a, b in zip(totals_row, row[1:])]
+        if not args.no_total:
+            writer.write(["Total"] + totals_row)
+    except ValueError as e:
+        print(f"error: {e}", file=stderr)
+        return 1
+    finally:
+        if handle is not stdout:
+            handle.close()
+    return 0
+
+
+def write_sweep(args, systems, controller, expansions, pm014, include_pm014, stdout):
+    """Write the building's cost-versus-spare table; spares that cannot be solved carry a Note."""
+    table = core.run_building_spare_sweep(
+        systems,
+        args.sweep,
+        controller,
+        expansions,
+        pm014,
+        include_pm014,
+        trane_multiplier=args.trane_multiplier,
+        tridium_multiplier=args.tridium_multiplier,
+        workers=args.workers,
+    )
+    handle = open(args.output, "w", newline="", encoding="utf-8") if args.output else stdout
+    try:
+        writer = RowWriter(handle, args.format, list(table.columns))
+        for row in table.astype(object).where(table.notna(), None).itertuples(index=False):
+            writer.write(list(row))
+    finally:
+        if handle is not stdout:
+            handle.close()
+    return 0
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.workers == 0:
+        args.workers = os.cpu_count() or 1
+    if args.verbose:
+        logging.basicConfig(level=logging.INFO, format="%(message)s")
+    if args.engine:
+        # Through the environment too, so worker processes pick it up.
+        os.environ["CALC_ENGINE"] = core.FORCED_ENGINE = args.engine
+    return run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
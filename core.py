@@ -1,11 +1,18 @@
-import pandas as pd
-from itertools import product
+from itertools import combinations, product
+import logging
 import math
-import requests
+import os
+import time
+from decimal import ROUND_HALF_UP, Decimal
 from io import StringIO
 from collections import OrderedDict
 from typing import Optional
 
+logger = logging.getLogger(__name__)
+
+# pandas and requests are imported inside the functions that need them so that
+# importing core (and therefore starting the GUI) stays cheap.
+
 ALL_SYSTEM_CONTROLLER_NAMES = [
     "S500", "S800",
     "JACE9000", "JACE9005", "JACE9010", "JACE9025", "JACE9100", "JACE9200"
@@ -13,6 +20,15 @@ ALL_SYSTEM_CONTROLLER_NAMES = [
 TRANE_EXPANSION_NAMES = ["XM90", "XM30", "XM32"]
 TRIDIUM_EXPANSION_NAMES = ["IO-R-16", "IO-R-34"]
 ALL_EXPANSION_NAMES = TRANE_EXPANSION_NAMES + TRIDIUM_EXPANSION_NAMES
+# Expansions that count towards a controller's max_io_modules, by controller brand.
+IO_MODULE_NAMES = {"Trane": TRANE_EXPANSION_NAMES, "Tridium": TRIDIUM_EXPANSION_NAMES}
+# Expansions enabled when none are named; the same defaults as the GUI checkboxes.
+DEFAULT_EXPANSIONS = {
+    "Trane": ["XM90", "XM30", "XM32"],
+    "Tridium": ["IO-R-34"],
+}
+# Rows kept (cheapest first) before the dominance filter.
+MAX_RESULTS = 500
 EXPECTED_COLUMNS = [
     *ALL_SYSTEM_CONTROLLER_NAMES,
     *ALL_EXPANSION_NAMES,
@@ -22,54 +38,131 @@ EXPECTED_COLUMNS = [
 ]
 
 
+# Hardware terminal types, in Controller.get_points() order.
+POINT_TYPES = ["BO", "BI", "UI", "AI", "UIAO", "BIAO", "PRESSURE"]
+
+# Which hardware terminal types each requested point type may be wired to,
+# in the order they are used. The coverage rules and the assignment behind the
+# Left columns are both derived from this table; dict order is the order in
+# which requested types are assigned.
+POINT_COMPATIBILITY = {
+    "BO": ("BO",),
+    "UI": ("UI", "UIAO"),
+    "AI": ("AI", "UI", "UIAO"),
+    "AO": ("UIAO", "BIAO"),
+    "BI": ("BI", "BIAO", "UI", "UIAO"),
+    "PRESSURE": ("PRESSURE",),
+}
+LEFT_COLUMNS = {
+    "BO": "BO Left", "BI": "BI Left", "UI": "UI Left", "AI": "AI Left",
+    "UIAO": "UI/AO Left", "BIAO": "BI/AO Left", "PRESSURE": "PRESSURE Left",
+}
+
+def coverage_rules(compatibility):
+    """Hall's condition for a compatibility table, as (requested types, terminal types) rules.
+
+    The requested points can all be wired iff, for every group of requested
+    types, their total fits in the terminals the group may use. Only groups
+    that are closed (no other type is limited to the same terminals) and
+    connected (linked through shared terminals) can bind; every other group
+    is implied by these.
+    """
+    types = list(compatibility)
+    rules = []
+    for size in range(1, len(types) + 1):
+        for group in combinations(types, size):
+            have = set().union(*(compatibility[t] for t in group))
+            if sum(1 for t in types if have.issuperset(compatibility[t])) != size:
+                continue
+            reached = {group[0]}
+            grew = True
+            while grew:
+                linked = set().union(*(compatibility[t] for t in reached))
+                grew = False
+                for t in group:
+                    if t not in reached and linked.intersection(compatibility[t]):
+                        reached.add(t)
+                        grew = True
+            if len(reached) == size:
+                rules.append((group, tuple(k for k in POINT_TYPES if k in have)))
+    return rules
+
+# valid_combination's inequalities: the requested points named on the left
+# must fit in the combination's capacity named on the right.
+COVERAGE_RULES = coverage_rules(POINT_COMPATIBILITY)
+
+def assign_points(requested: dict, capacity: dict, compatibility=POINT_COMPATIBILITY) -> dict:
+    """Wire requested points to terminals and return the unused capacity per terminal type.
+
+    Each requested type takes its terminals greedily in table order. Any
+    demand left over is then routed along augmenting paths, moving earlier
+    assignments to other compatible terminals, so the assignment is a maximum
+    flow whenever greedy alone falls short. Demand that cannot be wired at
+    all is ignored; valid_combination rejects such combinations.
+    """
+    left = dict(capacity)
+    flow = {t: {} for t in compatibility}
+    short = {}
+    for point_type, terminals in compatibility.items():
+        need = requested.get(point_type, 0)
+        for terminal in terminals:
+            use = min(left.get(terminal, 0), need)
+            if use > 0:
+                left[terminal] -= use
+                flow[point_type][terminal] = use
+                need -= use
+        if need > 0:
+            short[point_type] = need
+
+    for point_type, need in short.items():
+        while need > 0:
+            # Breadth-first search from point_type to a terminal with spare
+            # capacity; a terminal in use can be freed by moving its user.
+            parent = {("type", point_type): None}
+            queue = [("type", point_type)]
+            found = None
+            while queue and found is None:
+                kind, name = node = queue.pop(0)
+                if kind == "type":
+                    for terminal in compatibility[name]:
+                        step = ("terminal", terminal)
+                        if step not in parent:
+                            parent[step] = node
+                            if left.get(terminal, 0) > 0:
+                                found = step
+                                break
+                            queue.append(step)
+                else:
+                    for other, used in flow.items():
+                        step = ("type", other)
+                        if used.get(name, 0) > 0 and step not in parent:
+                            parent[step] = node
+                            queue.append(step)
+            if found is None:
+                break
+            path = []
+            node = found
+            while parent[node] is not None:
+                path.append((parent[node], node))
+                node = parent[node]
+            amount = min([need, left[found[1]]] + [
+                flow[dst[1]][src[1]] for src, dst in path if src[0] == "terminal"
+            ])
+            for src, dst in path:
+                if src[0] == "type":
+                    flow[src[1]][dst[1]] = flow[src[1]].get(dst[1], 0) + amount
+                else:
+                    flow[dst[1]][src[1]] -= amount
+            left[found[1]] -= amount
+            need -= amount
+    return left
+
 def compute_left_points(system_points: dict, total_points: dict) -> dict:
     """Return the remaining point capacity after satisfying the requested system points."""
-    sp = {k: int(system_points.get(k, 0) or 0) for k in ["BO","BI","UI","AI","AO","PRESSURE"]}
-    tp = {k: int(total_points.get(k, 0) or 0) for k in ["BO","BI","UI","AI","UIAO","BIAO","PRESSURE"]}
-
-    # BO and pressure have dedicated point types.
-    bo_left = max(0, tp["BO"] - sp["BO"])
-    pressure_left = max(0, tp["PRESSURE"] - sp["PRESSURE"])
-
-    # These pools can be consumed by multiple point types.
-    rem_UI   = tp["UI"]
-    rem_AI   = tp["AI"]
-    rem_UIAO = tp["UIAO"]
-    rem_BI   = tp["BI"]
-    rem_BIAO = tp["BIAO"]
-
-    # Consume dedicated UI first, then shared UI/AO capacity.
-    need = sp["UI"]
-    use = min(rem_UI, need); rem_UI -= use; need -= use
-    use = min(rem_UIAO, need); rem_UIAO -= use; need -= use
-
-    # AI can fall back to unused UI and UI/AO capacity.
-    need = sp["AI"]
-    use = min(rem_AI, need); rem_AI -= use; need -= use
-    use = min(rem_UI, need); rem_UI -= use; need -= use
-    use = min(rem_UIAO, need); rem_UIAO -= use; need -= use
-
-    # AO uses shared output-capable pools.
-    need = sp["AO"]
-    use = min(rem_UIAO, need); rem_UIAO -= use; need -= use
-    use = min(rem_BIAO, need); rem_BIAO -= use; need -= use
-
-    # BI can use BI, BI/AO, UI, and UI/AO capacity in that order.
-    need = sp["BI"]
-    use = min(rem_BI, need); rem_BI -= use; need -= use
-    use = min(rem_BIAO, need); rem_BIAO -= use; need -= use
-    use = min(rem_UI, need); rem_UI -= use; need -= use
-    use = min(rem_UIAO, need); rem_UIAO -= use; need -= use
-
-    return {
-        "BO Left": bo_left,
-        "BI Left": rem_BI,
-        "UI Left": rem_UI,
-        "AI Left": rem_AI,
-        "UI/AO Left": rem_UIAO,
-        "BI/AO Left": rem_BIAO,
-        "PRESSURE Left": pressure_left,
-    }
+    requested = {k: int(system_points.get(k, 0) or 0) for k in POINT_COMPATIBILITY}
+    capacity = {k: int(total_points.get(k, 0) or 0) for k in POINT_TYPES}
+    left = assign_points(requested, capacity)
+    return {LEFT_COLUMNS[k]: left[k] for k in POINT_TYPES}
 
 
 class Controller:
@@ -90,6 +183,7 @@ class Controller:
         max_point_capacity: int = 0,
         brand: str = "Trane",
         max_io_modules: Optional[int] = None,
+        module_limits: Optional[dict] = None,
     ):
         self.name = name
         self.price = price
@@ -107,6 +201,8 @@ class Controller:
         self.brand = brand
         # None means unlimited; 0 means no IO modules are allowed.
         self.max_io_modules = max_io_modules
+        # Optional per-expansion caps, e.g. {"XM90": 4}; missing names are unlimited.
+        self.module_limits = dict(module_limits or {})
 
     def get_points(self, quantity):
         return {
@@ -119,6 +215,199 @@ class Controller:
             "PRESSURE": self.PRESSURE * quantity,
         }
 
+def default_controllers():
+    """Build the controller/expansion catalog, keyed by product name, at list price."""
+    s500 = Controller("S500", power_AC=24, width=5.65, AI=5, UI=2, BI=3, BO=9, BIAO=2, PRESSURE=2, max_point_capacity=133, price=1367.00, brand="Trane", max_io_modules=None)
+    s800 = Controller("S800", power_DC=24, width=5.65, max_point_capacity=500, price=4015.00, brand="Trane", max_io_modules=None)
+
+    xm90 = Controller("XM90", power_AC=50, width=8.5, UI=16, UIAO=8, BO=8, price=3379.00, brand="Trane", max_io_modules=None)
+    xm30 = Controller("XM30", power_DC=120, width=2.11, UIAO=4, price=908.00, brand="Trane", max_io_modules=None)
+    xm32 = Controller("XM32", power_DC=100, width=2.82, BO=4, price=908.00, brand="Trane", max_io_modules=None)
+    pm014 = Controller("PM014", power_AC=75, width=5, price=621.00, brand="Trane", max_io_modules=None)
+
+    jace9000 = Controller("JACE9000", power_AC=24, power_DC=24, width=6.74, UI=0, UIAO=0, BO=0, AI=0, BI=0, BIAO=0, PRESSURE=0, max_point_capacity=0, price=4918.55, brand="Tridium", max_io_modules=0)
+    jace9005 = Controller("JACE9005", power_AC=24, power_DC=24, width=6.74, UI=0, UIAO=0, BO=0, AI=0, BI=0, BIAO=0, PRESSURE=0, max_point_capacity=250, price=8037.09, brand="Tridium", max_io_modules=5)
+    jace9010 = Controller("JACE9010", power_AC=24, power_DC=24, width=6.74, UI=0, UIAO=0, BO=0, AI=0, BI=0, BIAO=0, PRESSURE=0, max_point_capacity=500, price=9264.36, brand="Tridium", max_io_modules=16)
+    jace9025 = Controller("JACE9025", power_AC=24, power_DC=24, width=6.74, UI=0, UIAO=0, BO=0, AI=0, BI=0, BIAO=0, PRESSURE=0, max_point_capacity=1250, price=11097.73, brand="Tridium", max_io_modules=16)
+    jace9100 = Controller("JACE9100", power_AC=24, power_DC=24, width=6.74, UI=0, UIAO=0, BO=0, AI=0, BI=0, BIAO=0, PRESSURE=0, max_point_capacity=5000, price=21454.45, brand="Tridium", max_io_modules=16)
+    jace9200 = Controller("JACE9200", power_AC=24, power_DC=24, width=6.74, UI=0, UIAO=0, BO=0, AI=0, BI=0, BIAO=0, PRESSURE=0, max_point_capacity=10000, price=29180.50, brand="Tridium", max_io_modules=16)
+
+    io_r_16 = Controller("IO-R-16", power_AC=2, power_DC=2, width=3.25, UI=8, UIAO=4, BO=4, AI=0, BI=0, BIAO=0, PRESSURE=0, max_point_capacity=16, price=1258.32, brand="Tridium", max_io_modules=None)
+    io_r_34 = Controller("IO-R-34", power_AC=38, power_DC=38, width=6.8, UI=16, UIAO=8, BO=10, AI=0, BI=0, BIAO=0, PRESSURE=0, max_point_capacity=16, price=2800.00, brand="Tridium", max_io_modules=None)
+
+    controllers = {
+        "S500": s500,
+        "S800": s800,
+        "XM90": xm90,
+        "XM30": xm30,
+        "XM32": xm32,
+        "PM014": pm014,
+        "JACE9000": jace9000,
+        "JACE9005": jace9005,
+        "JACE9010": jace9010,
+        "JACE9025": jace9025,
+        "JACE9100": jace9100,
+        "JACE9200": jace9200,
+        "IO-R-16": io_r_16,
+        "IO-R-34": io_r_34,
+    }
+
+    return controllers
+
+def apply_prices(controllers, prices_df):
+    """Update catalog prices in place from a fetch_prices() frame."""
+    for _, row in prices_df.iterrows():
+        name = str(row[0]).strip().upper()
+        if name in controllers:
+            controllers[name].price = float(row[2])
+
+def resolve_expansions(controllers, controller, names):
+    """Return the expansion Controller objects to enable, checking brand compatibility.
+
+    names is a comma-separated string, or None for DEFAULT_EXPANSIONS.
+    """
+    allowed = IO_MODULE_NAMES.get(controller.brand, [])
+    if names is None:
+        selected = DEFAULT_EXPANSIONS[controller.brand]
+    else:
+        selected = [name.strip().upper() for name in names.split(",") if name.strip()]
+    invalid = [name for name in selected if name not in allowed]
+    if invalid:
+        raise ValueError(
+            f"{', '.join(invalid)} cannot be used with {controller.name}; choose from {', '.join(allowed)}"
+        )
+    # Keep catalog order so results match the GUI.
+    return [controllers[name] for name in allowed if name in selected]
+
+def to_cents(amount, multiplier=1.0):
+    """amount x multiplier in whole cents, rounded half up.
+
+    Computed in decimal from the shortest repr of each float, so list prices
+    such as 1258.32 give exactly 125832 and x 0.37 gives 46558.
+    """
+    value = Decimal(repr(float(amount))) * Decimal(repr(float(multiplier))) * 100
+    return int(value.quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+class CalcStats:
+    """Opt-in per-stage wall time (seconds) and counters for one calculation.
+
+    Stages: "scan" (the lattice scan of the vectorized and jit engines, or
+    building and filtering a FeasibleSet),
+    "enumerate" (lattice walk, including the coverage checks of the
+    reference walk), "validate" (the A @ x >= b check, for engines that feed
+    vectors to solve_vectors), "rows" (building rows,
+    including compute_left_points), "frame" (DataFrame build, sort and cut to
+    500 rows),
+    "dominance" (the redundant-combination filter). Callers may add their own,
+    e.g. the GUI adds "render". Counters: candidates, rejected_max_io,
+    rejected_infeasible, feasible, truncated, dominated, results, and
+    cache_hit when the frame came from RESULT_CACHE.
+    """
+
+    def __init__(self):
+        self.stages = OrderedDict()
+        self.counters = OrderedDict()
+        # Set by the auto engine: the engine it chose and why.
+        self.engine = None
+        self.engine_reason = None
+
+    def add_time(self, stage, seconds):
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    @property
+    def total_time(self):
+        return sum(self.stages.values())
+
+    def as_dict(self):
+        return {
+            "stages": dict(self.stages),
+            "counters": dict(self.counters),
+            "engine": self.engine,
+            "engine_reason": self.engine_reason,
+        }
+
+    def summary(self):
+        """One line for a status bar, e.g. "12.3 ms (enumerate 5.1, ...) | 1200 candidates, ..."."""
+        stages = ", ".join(f"{name} {seconds * 1000:.1f}" for name, seconds in self.stages.items())
+        labels = {
+            "candidates": "candidates",
+            "rejected_max_io": "pruned by module caps",
+            "rejected_infeasible": "infeasible",
+            "dominated": "dominated",
+            "results": "shown",
+            "cache_hit": "cached",
+        }
+        counters = ", ".join(
+            f"{self.counters[key]} {label}"
+            for key, label in labels.items()
+            if key in self.counters and (self.counters[key] or key in ("candidates", "results"))
+        )
+        engine = f" | {self.engine} engine" if self.engine else ""
+        return f"{self.total_time * 1000:.1f} ms ({stages}) | {counters}{engine}"
+
+
+class LinearConstraints:
+    """A system's COVERAGE_RULES compiled to linear form over its enabled modules.
+
+    A count vector x (in system.expansions order) is feasible iff A @ x >= b:
+    A[r][i] is the capacity one of module i adds to rule r, and b[r] is what
+    rule r still needs beyond the system controller's own capacity. The
+    point totals the Left columns are computed from are base + units @ x.
+    Compiled once per System; engines use arrays() for the NumPy form.
+    """
+
+    def __init__(self, system):
+        sp = system.system_points
+        base = system.system_controller.get_points(1)
+        unit_points = [exp.get_points(1) for exp in system.expansions]
+        self.needs = [sum(sp.get(k, 0) for k in need) for need, _ in COVERAGE_RULES]
+        self.have = [[1 if k in have else 0 for k in POINT_TYPES] for _, have in COVERAGE_RULES]
+        self.base = [base[k] for k in POINT_TYPES]
+        self.units = [[points[k] for k in POINT_TYPES] for points in unit_points]
+        self.A = [[sum(h * u for h, u in zip(row, unit)) for unit in self.units] for row in self.have]
+        self.b = [
+            need - sum(h * v for h, v in zip(row, self.base)) for need, row in zip(self.needs, self.have)
+        ]
+        # Rules as (b, column of A) pairs, the form the per-vector checks use.
+        self.rules = list(zip(self.b, self.A))
+        self._arrays = None
+
+    @property
+    def integral(self):
+        """True when every requested point count is an int, so bounds can use integer division."""
+        return all(isinstance(need, int) for need in self.needs)
+
+    def feasible(self, counts):
+        return all(sum(a * x for a, x in zip(row, counts)) >= b for b, row in self.rules)
+
+    def covers(self, total_points):
+        """The same test on point totals (a get_points()-style dict) instead of counts."""
+        totals = [total_points.get(k, 0) for k in POINT_TYPES]
+        return all(
+            sum(h * v for h, v in zip(row, totals)) >= need for need, row in zip(self.needs, self.have)
+        )
+
+    def point_totals(self, counts):
+        totals = dict(zip(POINT_TYPES, self.base))
+        for unit, x in zip(self.units, counts):
+            if x:
+                for k, v in zip(POINT_TYPES, unit):
+                    totals[k] += v * x
+        return totals
+
+    def arrays(self):
+        """(A, b) as NumPy arrays, A shaped (rules, modules)."""
+        if self._arrays is None:
+            import numpy as np
+
+            A = np.array(self.A, dtype=np.int64).reshape(len(self.b), len(self.units))
+            self._arrays = (A, np.array(self.b))
+        return self._arrays
+
+
 class System:
     def __init__(self, system_points, system_controller, expansions_list, pm014, include_pm014, brand_multipliers=None):
         self.system_points = system_points
@@ -132,6 +421,21 @@ class System:
         }
         if isinstance(brand_multipliers, dict):
             self.brand_multipliers.update(brand_multipliers)
+        # Multiplied unit prices in whole cents, fixed once per product. All
+        # price arithmetic is on these ints; Price is converted to dollars
+        # only when a row is built.
+        self.price_cents = {
+            product.name: to_cents(product.price, self._multiplier_for_brand(product.brand))
+            for product in [system_controller, pm014, *expansions_list]
+        }
+        self._constraints = None
+
+    @property
+    def constraints(self):
+        """The LinearConstraints for this system, compiled on first use."""
+        if self._constraints is None:
+            self._constraints = LinearConstraints(self)
+        return self._constraints
 
     def _multiplier_for_brand(self, brand):
         try:
@@ -155,68 +459,255 @@ class System:
             for name, capacity in capacity_map.items()
         }
 
-    def find_combinations(self):
-        total_combinations = []
+    def search_bounds(self):
+        """Enabled expansion names and the largest count the search considers for each."""
+        exp_max_map = self._max_by_expansion(self._required_total_points())
+        # Only build ranges for expansions that are enabled in the UI.
+        enabled_names = [e.name for e in self.expansions]
+        return enabled_names, [exp_max_map.get(name, 0) for name in enabled_names]
 
-        required_total_points = self._required_total_points()
-        exp_max_map = self._max_by_expansion(required_total_points)
+    def find_combinations(self, stats: Optional[CalcStats] = None):
+        enabled_names, uppers = self.search_bounds()
+        rows = self._walk_rows(enabled_names, uppers, stats)
+        if stats is not None:
+            # Vectors over a module cap are never generated; report how many were skipped.
+            lattice = math.prod(upper + 1 for upper in uppers)
+            stats.count("rejected_max_io", lattice - stats.counters.get("candidates", 0))
+        return self.filter_combinations(rows, stats)
+
+    def _walk_rows(self, enabled_names, uppers, stats: Optional[CalcStats] = None):
+        """Rows for every feasible vector of _count_vectors(), visited in the same order.
+
+        The lattice is walked like an odometer (last module fastest). The
+        slack A @ x - b of the compiled constraints and the point totals are
+        kept as running sums, so moving to
+        the next vector adds or removes one module's delta and allocates
+        nothing; only feasible vectors build a row. Price (integer cents),
+        width and VA sums use per-module prefix sums that repeat sum()'s
+        additions in the same order, so the floats match _row_sums() bit for
+        bit.
+        """
+        timed = stats is not None
+        now = time.perf_counter
+        if timed:
+            loop_start = now()
+            row_time = 0.0
+            generated = rejected_infeasible = 0
+
+        uppers, capped, budget = self.module_caps(enabled_names, uppers)
+        capped = [flag and budget is not None for flag in capped]
+        count = len(uppers)
+        constraints = self.constraints
+        # slack = A @ counts - b, kept up to date as the odometer turns.
+        slack = [-b for b in constraints.b]
+        rule_delta = [list(column) for column in zip(*constraints.A)]
+        totals = list(constraints.base)
+        point_delta = constraints.units
+        unit_price = [self.price_cents[exp.name] for exp in self.expansions]
+        unit_width = [exp.width for exp in self.expansions]
+        unit_va = [exp.power_AC for exp in self.expansions]
+        rules = range(len(slack))
+
+        counts = [0] * count
+        # prefix[i] holds the sums over modules 0..i; prefix sums from dirty on are stale.
+        price_prefix = [0] * count
+        width_prefix = [0] * count
+        va_prefix = [0] * count
+        dirty = 0
+        used = 0  # modules counted towards max_io_modules
+        rows = []
+        while True:
+            if timed:
+                generated += 1
+            feasible = True
+            for r in rules:
+                if slack[r] < 0:
+                    feasible = False
+                    break
+            if feasible:
+                for i in range(dirty, count):
+                    price_before, width_before, va_before = (
+                        (price_prefix[i - 1], width_prefix[i - 1], va_prefix[i - 1]) if i else (0, 0, 0)
+                    )
+                    price_prefix[i] = price_before + unit_price[i] * counts[i]
+                    width_prefix[i] = width_before + unit_width[i] * counts[i]
+                    va_prefix[i] = va_before + unit_va[i] * counts[i]
+                dirty = count
+                sums = (price_prefix[-1], width_prefix[-1], va_prefix[-1]) if count else (0, 0, 0)
+                if timed:
+                    t0 = now()
+                rows.append(self._build_row(enabled_names, counts, dict(zip(POINT_TYPES, totals)), sums))
+                if timed:
+                    row_time += now() - t0
+            elif timed:
+                rejected_infeasible += 1
+
+            # Advance the odometer: bump the last module that can still grow
+            # and reset the ones after it.
+            i = count - 1
+            while i >= 0:
+                if counts[i] < uppers[i] and not (capped[i] and used >= budget):
+                    counts[i] += 1
+                    delta = rule_delta[i]
+                    for r in rules:
+                        slack[r] += delta[r]
+                    for k, d in enumerate(point_delta[i]):
+                        totals[k] += d
+                    if capped[i]:
+                        used += 1
+                    break
+                q = counts[i]
+                if q:
+                    delta = rule_delta[i]
+                    for r in rules:
+                        slack[r] -= delta[r] * q
+                    for k, d in enumerate(point_delta[i]):
+                        totals[k] -= d * q
+                    if capped[i]:
+                        used -= q
+                    counts[i] = 0
+                i -= 1
+            if i < 0:
+                break
+            dirty = min(dirty, i)
+
+        if timed:
+            stats.add_time("enumerate", now() - loop_start - row_time)
+            stats.add_time("rows", row_time)
+            stats.count("candidates", generated)
+            stats.count("rejected_infeasible", rejected_infeasible)
+            stats.count("feasible", len(rows))
+        return rows
+
+    def solve_vectors(self, vectors, stats: Optional[CalcStats] = None):
+        """Build a row for every feasible count vector and rank them with filter_combinations.
+
+        vectors are count tuples in self.expansions order. Any engine that
+        yields, in product() order, a subsequence of _count_vectors() holding
+        every row that survives filter_combinations gets the reference output.
+        """
+        total_combinations = []
+        # Timing is only taken when stats is given, to keep the loop lean otherwise.
+        timed = stats is not None
+        now = time.perf_counter
+        if timed:
+            loop_start = now()
+            validate_time = row_time = 0.0
+            generated = rejected_infeasible = 0
 
-        # Only build ranges for expansions that are enabled in the UI.
         enabled_names = [e.name for e in self.expansions]
-        ranges = [range(exp_max_map.get(name, 0) + 1) for name in enabled_names]
-
-        for counts in product(*ranges) if ranges else [()]:
-            # Start with zero counts for every expansion, then fill the enabled ones.
-            counts_map = {name: 0 for name in ALL_EXPANSION_NAMES}
-            for name, qty in zip(enabled_names, counts):
-                counts_map[name] = qty
-
-            if self.system_controller.max_io_modules is not None:
-                tridium_io_count = sum(counts_map[name] for name in TRIDIUM_EXPANSION_NAMES)
-                if tridium_io_count > self.system_controller.max_io_modules:
-                    continue
-
-            # Compute points for this combo
-            combination_points = self.get_combination_points({exp: counts_map[exp.name] for exp in self.expansions})
-            if not self.valid_combination(combination_points):
+        constraints = self.constraints
+        for counts in vectors:
+            if timed:
+                generated += 1
+                t0 = now()
+            valid = constraints.feasible(counts)
+            if timed:
+                validate_time += now() - t0
+            if not valid:
+                if timed:
+                    rejected_infeasible += 1
                 continue
-
-            price = sum(
-                (exp.price * self._multiplier_for_brand(exp.brand)) * counts_map[exp.name]
-                for exp in self.expansions
+            if timed:
+                t0 = now()
+            counts_map = dict.fromkeys(ALL_EXPANSION_NAMES, 0)
+            counts_map.update(zip(enabled_names, counts))
+            total_combinations.append(
+                self._build_row(
+                    enabled_names, counts, constraints.point_totals(counts), self._row_sums(counts_map)
+                )
             )
-            width = sum(exp.width * counts_map[exp.name] for exp in self.expansions)
-
-            qty_pm014 = 0
-            if self.include_pm014 and self.system_controller.brand == "Trane":
-                total_xm30_32 = counts_map["XM30"] + counts_map["XM32"]
-                total_xm90 = counts_map["XM90"]
-                qty_pm014 = max(0, math.ceil((total_xm30_32 - (2 * total_xm90) - 2) / 11))
-                if self.system_controller.name == "S800":
-                    qty_pm014 += 1
-
-            controller_name = self.system_controller.name
-            ordered = OrderedDict({name: 0 for name in ALL_SYSTEM_CONTROLLER_NAMES})
-            ordered[controller_name] = 1
-            for name in ALL_EXPANSION_NAMES:
-                ordered[name] = counts_map[name]
-            ordered["PM014"] = qty_pm014
-            left_map = compute_left_points(self.system_points, combination_points)
-            for k, v in left_map.items():
-                ordered[k] = v
-
-            total_va = self.system_controller.power_AC
-            total_va += sum(exp.power_AC * counts_map[exp.name] for exp in self.expansions)
-            total_va += self.pm014.power_AC * qty_pm014
-            ordered["Total VA"] = total_va
-
-            controller_price = self.system_controller.price * self._multiplier_for_brand(self.system_controller.brand)
-            pm014_price = self.pm014.price * self._multiplier_for_brand(self.pm014.brand)
-            ordered["Price"] = round(price + controller_price + (pm014_price * qty_pm014), 2)
-            ordered["Width"] = round(width + self.system_controller.width + (self.pm014.width * qty_pm014), 2)
-            total_combinations.append(ordered)
-
-        return self.filter_combinations(total_combinations)
+            if timed:
+                row_time += now() - t0
+
+        if timed:
+            stats.add_time("enumerate", now() - loop_start - validate_time - row_time)
+            stats.add_time("validate", validate_time)
+            stats.add_time("rows", row_time)
+            stats.count("candidates", generated)
+            stats.count("rejected_infeasible", rejected_infeasible)
+            stats.count("feasible", len(total_combinations))
+        return self.filter_combinations(total_combinations, stats)
+
+    def _build_row(self, enabled_names, counts, combination_points, sums):
+        """One result row as a list in EXPECTED_COLUMNS order.
+
+        sums are the (price, width, VA) sums over the expansions, as returned
+        by _row_sums().
+        """
+        counts_map = dict.fromkeys(ALL_EXPANSION_NAMES, 0)
+        counts_map.update(zip(enabled_names, counts))
+        qty_pm014 = self.pm014_quantity(counts_map)
+        row = [1 if name == self.system_controller.name else 0 for name in ALL_SYSTEM_CONTROLLER_NAMES]
+        row += [counts_map[name] for name in ALL_EXPANSION_NAMES]
+        row.append(qty_pm014)
+        row += compute_left_points(self.system_points, combination_points).values()
+        price, width, va = sums
+        total_va = self.system_controller.power_AC
+        total_va += va
+        total_va += self.pm014.power_AC * qty_pm014
+        row.append(total_va)
+        row.append(self._total_cents(price, qty_pm014) / 100)
+        row.append(round(width + self.system_controller.width + (self.pm014.width * qty_pm014), 2))
+        return row
+
+    def pm014_quantity(self, counts_map):
+        qty_pm014 = 0
+        if self.include_pm014 and self.system_controller.brand == "Trane":
+            total_xm30_32 = counts_map["XM30"] + counts_map["XM32"]
+            total_xm90 = counts_map["XM90"]
+            qty_pm014 = max(0, math.ceil((total_xm30_32 - (2 * total_xm90) - 2) / 11))
+            if self.system_controller.name == "S800":
+                qty_pm014 += 1
+        return qty_pm014
+
+    def _row_sums(self, counts_map):
+        """(price in cents, width, VA) summed over the expansions, in self.expansions order."""
+        price = sum(self.price_cents[exp.name] * counts_map[exp.name] for exp in self.expansions)
+        width = sum(exp.width * counts_map[exp.name] for exp in self.expansions)
+        va = sum(exp.power_AC * counts_map[exp.name] for exp in self.expansions)
+        return price, width, va
+
+    def _total_cents(self, price_cents, qty_pm014):
+        """Expansion cents plus the controller and PM014 modules."""
+        return (
+            price_cents
+            + self.price_cents[self.system_controller.name]
+            + self.price_cents[self.pm014.name] * qty_pm014
+        )
+
+    def combination_cents(self, counts_map, qty_pm014):
+        """The row's Price in integer cents; engines rank by this."""
+        return self._total_cents(self._row_sums(counts_map)[0], qty_pm014)
+
+    def combination_price(self, counts_map, qty_pm014):
+        """The row's Price in dollars."""
+        return self.combination_cents(counts_map, qty_pm014) / 100
+
+    def _count_vectors(self, enabled_names, uppers):
+        """Yield expansion count tuples in product() order, generating only those within module caps.
+
+        uppers[i] is the largest count considered for enabled_names[i]. The
+        controller's module_limits lower individual bounds, and max_io_modules
+        bounds the running total of its brand's IO modules, so over-cap
+        vectors are pruned level by level instead of enumerated and rejected.
+        """
+        uppers, capped, budget = self.module_caps(enabled_names, uppers)
+        if budget is None:
+            return product(*(range(upper + 1) for upper in uppers))
+        return _capped_counts(uppers, capped, budget)
+
+    def module_caps(self, enabled_names, uppers):
+        """Apply the controller's module caps to uppers.
+
+        Returns (uppers lowered by module_limits, which positions count
+        towards max_io_modules, max_io_modules).
+        """
+        controller = self.system_controller
+        limits = controller.module_limits
+        uppers = [min(upper, limits.get(name, upper)) for name, upper in zip(enabled_names, uppers)]
+        io_names = IO_MODULE_NAMES.get(controller.brand, ())
+        return uppers, [name in io_names for name in enabled_names], controller.max_io_modules
 
     def get_combination_points(self, combination):
         total_points = self.system_controller.get_points(1)
@@ -227,68 +718,425 @@ class System:
         return total_points
         
     def valid_combination(self, total_points):
-        sp = self.system_points
-        tp = total_points
-        checks = [
-            sp.get("BO", 0) <= tp.get("BO", 0),
-            sp.get("UI", 0) <= tp.get("UI", 0) + tp.get("UIAO", 0),
-            sp.get("AO", 0) <= tp.get("BIAO", 0) + tp.get("UIAO", 0),
-            sp.get("BI", 0) <= tp.get("BI", 0) + tp.get("BIAO", 0) + tp.get("UI", 0) + tp.get("UIAO", 0),
-            sp.get("AI", 0) <= tp.get("AI", 0) + tp.get("UI", 0) + tp.get("UIAO", 0),
-            sp.get("AI", 0) + sp.get("UI", 0) <= tp.get("AI", 0) + tp.get("UI", 0) + tp.get("UIAO", 0),
-            sp.get("BI", 0) + sp.get("UI", 0) + sp.get("AO", 0) <= (
-                tp.get("BI", 0) + tp.get("BIAO", 0) + tp.get("UI", 0) + tp.get("UIAO", 0)
-            ),
-            sp.get("BI", 0) + sp.get("UI", 0) + sp.get("AI", 0) + sp.get("AO", 0) <= (
-                tp.get("BI", 0) + tp.get("BIAO", 0) + tp.get("UI", 0) + tp.get("UIAO", 0) + tp.get("AI", 0)
-            ),
-            sp.get("PRESSURE", 0) <= tp.get("PRESSURE", 0)
-        ]
-        return all(checks)
+        return self.constraints.covers(total_points)
+
+    def filter_combinations(self, combinations, stats: Optional[CalcStats] = None):
+        import pandas as pd
 
-    def filter_combinations(self, combinations):
+        start = time.perf_counter()
         # Preserve the expected schema even when no valid combinations are found.
         if not combinations:
+            if stats is not None:
+                stats.add_time("frame", time.perf_counter() - start)
+                stats.count("results", 0)
             return pd.DataFrame(columns=EXPECTED_COLUMNS)
 
-        df = pd.DataFrame(combinations).sort_values(by="Price").reset_index(drop=True).head(500)
+        # Rows are lists in EXPECTED_COLUMNS order. Stable sorts: equal prices
+        # keep enumeration order, whichever engine produced the rows.
+        df = pd.DataFrame(combinations, columns=EXPECTED_COLUMNS)
+        df = df.sort_values(by="Price", kind="stable").reset_index(drop=True).head(MAX_RESULTS).copy()
+        if stats is not None:
+            dominance_start = time.perf_counter()
+            stats.add_time("frame", dominance_start - start)
+            stats.count("truncated", len(combinations) - len(df))
 
-        # Fill any missing columns so downstream UI code can rely on a stable shape.
-        for col in EXPECTED_COLUMNS:
-            if col not in df.columns:
-                df[col] = 0.0 if col in ("Price", "Width") else 0
-        df = df[EXPECTED_COLUMNS].copy()
-
-        # Drop combinations that cost more without reducing module counts.
+        # Drop combinations that cost more without reducing module counts: row i
+        # goes if some row j is no more expensive and uses no more of every
+        # module and fewer of at least one. All pairs are compared at once.
         expansion_cols = ALL_EXPANSION_NAMES + ["PM014"]
-        keep_rows = []
-        for i, row_i in df.iterrows():
-            is_redundant = False
-            for j, row_j in df.iterrows():
-                if i == j:
-                    continue
-                cheaper_or_equal = row_j["Price"] <= row_i["Price"]
-                strictly_better_modules = all(row_j[c] <= row_i[c] for c in expansion_cols) and any(
-                    row_j[c] < row_i[c] for c in expansion_cols
-                )
-                if cheaper_or_equal and strictly_better_modules:
-                    is_redundant = True
-                    break
-            if not is_redundant:
-                keep_rows.append(i)
+        prices = df["Price"].to_numpy()
+        counts = df[expansion_cols].to_numpy()
+        fewer_or_equal = (counts[:, None, :] <= counts[None, :, :]).all(axis=2)  # [j, i]
+        strictly_fewer = (counts[:, None, :] < counts[None, :, :]).any(axis=2)
+        cheaper_or_equal = prices[:, None] <= prices[None, :]
+        redundant = (fewer_or_equal & strictly_fewer & cheaper_or_equal).any(axis=0)
 
-        filtered_df = df.loc[keep_rows].copy()
+        filtered_df = df.loc[~redundant].copy()
         count_cols = [c for c in filtered_df.columns if c not in ("Price", "Width")]
         filtered_df[count_cols] = filtered_df[count_cols].astype(int)
-        filtered_df = filtered_df.sort_values(by="Price").reset_index(drop=True)
+        filtered_df = filtered_df.sort_values(by="Price", kind="stable").reset_index(drop=True)
+        if stats is not None:
+            stats.add_time("dominance", time.perf_counter() - dominance_start)
+            stats.count("dominated", len(df) - len(filtered_df))
+            stats.count("results", len(filtered_df))
         return filtered_df
 
+def tridium_frontier_applies(system):
+    """Whether the layout has the structure tridium_frontier() needs (it may still return None)."""
+    if system.system_controller.brand != "Tridium" or len(system.expansions) > 2:
+        return False
+    if any(system.price_cents[exp.name] < 0 for exp in system.expansions):
+        return False
+    return system.constraints.integral
+
+def tridium_frontier(system):
+    """Pareto-minimal feasible count vectors of a Tridium system in product() order, or None.
+
+    A JACE's IO modules add capacity linearly, so for a fixed count q1 of the
+    first enabled module each coverage rule gives the least count of the
+    second directly, and the feasible vectors form an up-closed set. With
+    non-negative prices every non-minimal vector costs at least as much as a
+    minimal one below it and is dropped by the dominance filter, so the
+    minimal vectors alone reproduce find_combinations once every feasible
+    vector fits in the MAX_RESULTS cut. This is O(max_io_modules). Returns
+    None when those conditions do not hold (not Tridium, more than two
+    modules enabled, negative prices, non-integer points, or more than
+    MAX_RESULTS feasible vectors) so the caller can fall back.
+    """
+    if not tridium_frontier_applies(system):
+        return None
+    constraints = system.constraints
+    enabled_names, uppers = system.search_bounds()
+    uppers, capped, budget = system.module_caps(enabled_names, uppers)
+    dims = len(uppers)
+    if dims == 0:
+        return [()]
+    upper1, upper2 = uppers[0], uppers[1] if dims == 2 else 0
+    capped1, capped2 = capped[0], dims == 2 and capped[1]
+    if budget is not None and capped1:
+        upper1 = min(upper1, budget)
+
+    # (still needed at q1 = 0, supply per first module, supply per second module)
+    # per rule; a missing second module supplies nothing.
+    rules = [(b, row[0], row[1] if dims == 2 else 0) for b, row in constraints.rules]
+
+    frontier = []
+    feasible = 0
+    best = None
+    for q1 in range(upper1 + 1):
+        high = upper2
+        if budget is not None and capped2:
+            high = min(high, budget - (q1 if capped1 else 0))
+        low = 0
+        for need, per1, per2 in rules:
+            rest = need - q1 * per1
+            if rest <= 0:
+                continue
+            if per2 <= 0:
+                low = high + 1
+                break
+            low = max(low, -(-rest // per2))
+        if low > high:
+            continue
+        feasible += high - low + 1
+        if best is None or low < best:
+            frontier.append((q1, low) if dims == 2 else (q1,))
+            best = low
+    if feasible > MAX_RESULTS:
+        return None
+    return frontier
+
+def trane_top_vectors_applies(system):
+    """Whether trane_top_vectors() can solve the layout."""
+    if system.system_controller.brand != "Trane" or system.system_controller.max_io_modules is not None:
+        return False
+    prices = [system.price_cents[exp.name] for exp in system.expansions]
+    if min(prices + [system.price_cents[system.pm014.name]]) < 0:
+        return False
+    constraints = system.constraints
+    if not constraints.integral:
+        return False
+    # The outer dimension is XM90 when enabled; every other module must
+    # appear in rules that no other free module appears in.
+    enabled_names = [exp.name for exp in system.expansions]
+    outer = enabled_names.index("XM90") if "XM90" in enabled_names else None
+    free = [i for i in range(len(enabled_names)) if i != outer]
+    return not any(sum(1 for i in free if per[i] > 0) > 1 for _, per in constraints.rules)
+
+def trane_top_vectors(system, limit=MAX_RESULTS):
+    """The limit cheapest feasible count vectors of a Trane system in product() order, or None.
+
+    Only XM90 supplies several point types. XM30 adds only UI/AO and XM32
+    only BO, so once the XM90 count is fixed the coverage rules give
+    independent lower bounds for XM30 and XM32, and the feasible vectors for
+    that XM90 count form a rectangle. Price never falls as XM30 or XM32 grow,
+    so a best-first walk from each rectangle's corner pops vectors in
+    (Price, product order) order. The first limit popped are exactly the rows
+    find_combinations keeps before its dominance filter. Returns None when
+    the layout is not separable like this, a price is negative, or
+    max_io_modules applies.
+    """
+    import heapq
+
+    if not trane_top_vectors_applies(system):
+        return None
+    enabled_names, uppers = system.search_bounds()
+    uppers, _, _ = system.module_caps(enabled_names, uppers)
+    outer = enabled_names.index("XM90") if "XM90" in enabled_names else None
+    free = [i for i in range(len(enabled_names)) if i != outer]
+    rules = system.constraints.rules
+
+    def price_of(vector):
+        counts_map = dict.fromkeys(ALL_EXPANSION_NAMES, 0)
+        counts_map.update(zip(enabled_names, vector))
+        return system.combination_cents(counts_map, system.pm014_quantity(counts_map))
+
+    heap = []
+    for q_outer in range(uppers[outer] + 1 if outer is not None else 1):
+        lows = dict.fromkeys(free, 0)
+        feasible = True
+        for need, per in rules:
+            rest = need - (q_outer * per[outer] if outer is not None else 0)
+            if rest <= 0:
+                continue
+            owner = next((i for i in free if per[i] > 0), None)
+            if owner is None:
+                feasible = False
+                break
+            lows[owner] = max(lows[owner], -(-rest // per[owner]))
+        if not feasible or any(lows[i] > uppers[i] for i in free):
+            continue
+        corner = [0] * len(enabled_names)
+        if outer is not None:
+            corner[outer] = q_outer
+        for i in free:
+            corner[i] = lows[i]
+        corner = tuple(corner)
+        # A cell's only parent lowers its first free count that is above the
+        # lower bound, so each cell is pushed once: step along a free
+        # dimension, and keep stepping along later ones only while this one
+        # is still at its lower bound.
+        heapq.heappush(heap, (price_of(corner), corner, lows))
+
+    chosen = []
+    while heap and len(chosen) < limit:
+        _, vector, lows = heapq.heappop(heap)
+        chosen.append(vector)
+        for i in free:
+            if vector[i] < uppers[i]:
+                step = list(vector)
+                step[i] += 1
+                step = tuple(step)
+                heapq.heappush(heap, (price_of(step), step, lows))
+            if vector[i] != lows[i]:
+                break
+    chosen.sort()
+    return chosen
+
+# Rows per NumPy chunk in lattice scans (a few MB of int64 counts).
+VECTOR_CHUNK = 1 << 18
+
+def _feasible_chunks(shape, A, b, capped, budget, chunk_size=VECTOR_CHUNK):
+    """Yield (flat product() index, count matrix) for the feasible vectors of each lattice chunk.
+
+    The module caps and A @ x >= b are applied to all rows of a chunk at once.
+    """
+    import numpy as np
+
+    capped_columns = [i for i, flag in enumerate(capped) if flag]
+    size = math.prod(shape)
+    for start in range(0, size, chunk_size):
+        index = np.arange(start, min(size, start + chunk_size), dtype=np.int64)
+        if shape:
+            X = np.stack(np.unravel_index(index, shape), axis=1)
+        else:
+            X = np.zeros((len(index), 0), dtype=np.int64)
+        mask = (X @ A.T >= b).all(axis=1)
+        if budget is not None and capped_columns:
+            mask &= X[:, capped_columns].sum(axis=1) <= budget
+        if mask.any():
+            yield index[mask], X[mask]
+
+def _price_cents_many(system, X):
+    """combination_cents() for every row of X (counts in system.expansions order)."""
+    import numpy as np
+
+    enabled_names = [exp.name for exp in system.expansions]
+    price = X @ np.array([system.price_cents[name] for name in enabled_names], dtype=np.int64)
+    qty_pm014 = 0
+    if system.include_pm014 and system.system_controller.brand == "Trane":
+        # pm014_quantity() on whole columns; -(-n // 11) is ceil(n / 11) for ints.
+        count = lambda name: X[:, enabled_names.index(name)] if name in enabled_names else 0
+        qty_pm014 = np.maximum(0, -(-(count("XM30") + count("XM32") - 2 * count("XM90") - 2) // 11))
+        if system.system_controller.name == "S800":
+            qty_pm014 = qty_pm014 + 1
+    return system._total_cents(price, qty_pm014)
+
+def _cheapest(prices, limit):
+    """Mask of the rows priced at most the limit-th lowest price (ties at the cut included)."""
+    import numpy as np
+
+    if len(prices) <= limit:
+        return np.ones(len(prices), dtype=bool)
+    return prices <= np.partition(prices, limit - 1)[limit - 1]
+
+def vectorized_top_vectors(system, limit=MAX_RESULTS, chunk_size=VECTOR_CHUNK):
+    """The limit cheapest feasible count vectors in product() order, found with NumPy.
+
+    The module-capped lattice is scanned in chunks of product() order by
+    _feasible_chunks(). Prices are exact integer cents, so keeping every
+    vector priced at most the limit-th cheapest seen so far keeps all of the
+    limit cheapest by (Price, product order), ties included, and memory stays
+    bounded by the chunk. Works for any brand, caps or prices.
+    """
+    import numpy as np
+
+    enabled_names, uppers = system.search_bounds()
+    uppers, capped, budget = system.module_caps(enabled_names, uppers)
+    A, b = system.constraints.arrays()
+    shape = tuple(upper + 1 for upper in uppers)
+
+    kept_index = np.empty(0, dtype=np.int64)
+    kept_price = np.empty(0, dtype=np.int64)
+    for index, X in _feasible_chunks(shape, A, b, capped, budget, chunk_size):
+        kept_index = np.concatenate([kept_index, index])
+        kept_price = np.concatenate([kept_price, _price_cents_many(system, X)])
+        keep = _cheapest(kept_price, limit)
+        kept_index, kept_price = kept_index[keep], kept_price[keep]
+
+    if not shape:
+        return [()] * len(kept_index)
+    kept_index.sort()
+    return [tuple(row) for row in np.stack(np.unravel_index(kept_index, shape), axis=1).tolist()]
+
+def spec_key(product):
+    """Hashable specs of a catalog product other than its price: everything feasibility depends on.
+
+    Equal for equal products built separately (e.g. default_controllers()
+    again, or after a price update), unlike the objects themselves.
+    """
+    from result_cache import SPEC_FIELDS
+
+    key = []
+    for field in SPEC_FIELDS:
+        if field != "price":
+            value = getattr(product, field)
+            key.append(tuple(sorted(value.items())) if isinstance(value, dict) else value)
+    return tuple(key)
+
+class FeasibleSet:
+    """Feasible count vectors shared by several Systems on one controller, kept as arrays.
+
+    Built once for the loosest of the systems: every expansion any of them
+    enables (in catalog order), the largest search bound per expansion and
+    the smallest requested count per point type. Each system's own lattice,
+    with fewer points, fewer expansions or lower bounds, is then a subset of
+    vectors, and solve() answers it by filtering instead of enumerating.
+    Filtering keeps product() order, so solve() returns exactly what
+    run_calculations returns for that system.
+    """
+
+    def __init__(self, systems, chunk_size=VECTOR_CHUNK):
+        import numpy as np
+
+        first = systems[0]
+        self.controller = first.system_controller
+        self.controller_key = spec_key(self.controller)
+        enabled = {exp.name: exp for system in systems for exp in system.expansions}
+        self.names = [name for name in ALL_EXPANSION_NAMES if name in enabled]
+        self.expansion_keys = {name: spec_key(enabled[name]) for name in self.names}
+        bounds = dict.fromkeys(self.names, 0)
+        for system in systems:
+            enabled_names, uppers = system.search_bounds()
+            for name, upper in zip(enabled_names, system.module_caps(enabled_names, uppers)[0]):
+                bounds[name] = max(bounds[name], upper)
+        self.uppers = [bounds[name] for name in self.names]
+        points = {
+            k: min(int(system.system_points.get(k, 0) or 0) for system in systems)
+            for k in POINT_COMPATIBILITY
+        }
+        loosest = System(points, self.controller, [enabled[name] for name in self.names], first.pm014, False)
+        _, capped, budget = loosest.module_caps(self.names, self.uppers)
+        A, b = loosest.constraints.arrays()
+        chunks = [X for _, X in _feasible_chunks(tuple(u + 1 for u in self.uppers), A, b, capped, budget, chunk_size)]
+        self.vectors = np.concatenate(chunks) if chunks else np.zeros((0, len(self.names)), dtype=np.int64)
+
+    def __len__(self):
+        return len(self.vectors)
+
+    def covers(self, system):
+        """Whether system's lattice is inside this set, so solve() can answer it."""
+        enabled_names, uppers = system.search_bounds()
+        if spec_key(system.system_controller) != self.controller_key:
+            return False
+        if any(self.expansion_keys.get(exp.name) != spec_key(exp) for exp in system.expansions):
+            return False
+        if enabled_names != [name for name in self.names if name in enabled_names]:
+            return False
+        uppers = system.module_caps(enabled_names, uppers)[0]
+        return all(upper <= self.uppers[self.names.index(name)] for name, upper in zip(enabled_names, uppers))
+
+    def top_vectors(self, system, limit=MAX_RESULTS):
+        """The limit cheapest of system's feasible vectors (with ties), in product() order."""
+        enabled_names, uppers = system.search_bounds()
+        uppers = system.module_caps(enabled_names, uppers)[0]
+        columns = [self.names.index(name) for name in enabled_names]
+        others = [i for i in range(len(self.names)) if i not in columns]
+        X = self.vectors
+        A, b = system.constraints.arrays()
+        mask = (X[:, others] == 0).all(axis=1) & (X[:, columns] <= uppers).all(axis=1)
+        X = X[mask][:, columns]
+        X = X[(X @ A.T >= b).all(axis=1)]
+        X = X[_cheapest(_price_cents_many(system, X), limit)]
+        return [tuple(row) for row in X.tolist()]
+
+    def solve(self, system, stats: Optional[CalcStats] = None):
+        """The run_calculations frame for system, from this set when it covers system."""
+        if not self.covers(system):
+            return ENGINES["auto"](system, stats)
+        start = time.perf_counter()
+        vectors = self.top_vectors(system)
+        if stats is not None:
+            stats.add_time("scan", time.perf_counter() - start)
+        return system.solve_vectors(vectors, stats)
+
+def jit_top_vectors(system, limit=MAX_RESULTS, kernel=None):
+    """vectorized_top_vectors() computed by the jit_kernel odometer, or None without Numba.
+
+    The kernel streams feasible vectors into a top-K buffer instead of
+    materialising lattice chunks, so memory stays at a few times limit rows
+    however large the lattice is. kernel defaults to jit_kernel.compiled().
+    """
+    import numpy as np
+    import jit_kernel
+
+    kernel = kernel or jit_kernel.compiled()
+    if kernel is None:
+        return None
+    enabled_names, uppers = system.search_bounds()
+    A, b = system.constraints.arrays()
+    if not enabled_names:
+        # The controller alone: the empty vector, if it covers the points.
+        return [()] if (b <= 0).all() else []
+    uppers, capped, budget = system.module_caps(enabled_names, uppers)
+    controller = system.system_controller
+    pm014_columns = []
+    if system.include_pm014 and controller.brand == "Trane":
+        pm014_columns = [enabled_names.index(name) if name in enabled_names else -1 for name in ("XM30", "XM32", "XM90")]
+    kept = kernel(
+        np.array(uppers, dtype=np.int64),
+        A,
+        b.astype(np.float64),
+        np.array(capped, dtype=np.bool_),
+        -1 if budget is None else int(budget),
+        np.array([system.price_cents[name] for name in enabled_names], dtype=np.int64),
+        system.price_cents[controller.name],
+        system.price_cents[system.pm014.name],
+        np.array(pm014_columns, dtype=np.int64),
+        1 if pm014_columns and controller.name == "S800" else 0,
+        limit,
+    )
+    return [tuple(row) for row in kept.tolist()]
+
+def _capped_counts(uppers, capped, budget):
+    """product(range(u + 1) for u in uppers) minus tuples whose capped entries sum past budget."""
+    if not uppers:
+        yield ()
+        return
+    first = min(uppers[0], budget) if capped[0] else uppers[0]
+    for qty in range(first + 1):
+        remaining = budget - qty if capped[0] else budget
+        for tail in _capped_counts(uppers[1:], capped[1:], remaining):
+            yield (qty,) + tail
+
 class Enclosure:
     def __init__(self, rail_qty=0, rail_size=0, tx_qty=0):
         self.rail_qty = rail_qty
         self.rail_size = rail_size
         self.tx_qty = tx_qty
 
+PRICES_URL = "https://raw.githubusercontent.com/felipeacevedo1014/controller_calculator/refs/heads/main/prices.csv"
+
 DEFAULT_PRICES_TEXT = """s500,BMSY500AAA0100011,1367.00
 xm90,X13651701001,3379.00
 xm30,X13651537010,908.00
@@ -312,6 +1160,8 @@ PRICES_FETCH_ERROR = ""
 def fetch_prices(prices_url):
     """Fetch live price data and fall back to the embedded default catalog if needed."""
     global PRICES_FALLBACK_USED, PRICES_USED_DF, PRICES_FETCH_ERROR
+    import pandas as pd
+    import requests
 
     try:
         response = requests.get(url=prices_url, timeout=10)
@@ -339,6 +1189,127 @@ def fetch_prices(prices_url):
         PRICES_USED_DF = df
         return df
 
+# Solve engines by name. Each is solve(system, stats) -> frame and must return
+# exactly what System.find_combinations returns; fuzz.py checks that.
+ENGINES = OrderedDict()
+
+def register_engine(name, solve):
+    ENGINES[name] = solve
+
+def _reference_engine(system, stats=None):
+    return system.find_combinations(stats)
+
+register_engine("reference", _reference_engine)
+
+def _lattice_fallback(system, stats=None):
+    # For closed forms that do not apply: enumerate, by the cheapest means for the lattice size.
+    name, reason = lattice_engine(lattice_cells(system))
+    logger.info("%s: closed form not applicable, %s engine, %s", system.system_controller.name, name, reason)
+    if stats is not None:
+        stats.engine = name
+        stats.engine_reason = reason
+    return ENGINES[name](system, stats)
+
+def _tridium_engine(system, stats=None):
+    vectors = tridium_frontier(system)
+    if vectors is None:
+        return _lattice_fallback(system, stats)
+    return system.solve_vectors(vectors, stats)
+
+register_engine("tridium", _tridium_engine)
+
+def _trane_engine(system, stats=None):
+    vectors = trane_top_vectors(system)
+    if vectors is None:
+        return _lattice_fallback(system, stats)
+    return system.solve_vectors(vectors, stats)
+
+register_engine("trane", _trane_engine)
+
+def _vectorized_engine(system, stats=None):
+    start = time.perf_counter()
+    vectors = vectorized_top_vectors(system)
+    if stats is not None:
+        stats.add_time("scan", time.perf_counter() - start)
+    return system.solve_vectors(vectors, stats)
+
+register_engine("vectorized", _vectorized_engine)
+
+def _jit_engine(system, stats=None):
+    # Numba is optional: without it this is the vectorized engine.
+    start = time.perf_counter()
+    vectors = jit_top_vectors(system)
+    if vectors is None:
+        vectors = vectorized_top_vectors(system)
+    if stats is not None:
+        stats.add_time("scan", time.perf_counter() - start)
+    return system.solve_vectors(vectors, stats)
+
+register_engine("jit", _jit_engine)
+
+# Below this many lattice cells the reference walk beats the fixed cost of a NumPy scan.
+SMALL_LATTICE = 1000
+
+def lattice_cells(system):
+    """Estimated count vectors a full enumeration visits: the lattice after module caps."""
+    enabled_names, uppers = system.search_bounds()
+    uppers, capped, budget = system.module_caps(enabled_names, uppers)
+    if budget is not None:
+        uppers = [min(upper, budget) if flag else upper for upper, flag in zip(uppers, capped)]
+    return math.prod(upper + 1 for upper in uppers)
+
+def select_engine(system):
+    """Pick the engine for system from its search space; returns (name, reason).
+
+    A closed form is used whenever the layout's structure allows it, since
+    its cost does not depend on the lattice. Otherwise small lattices are
+    walked directly and larger ones scanned, by the compiled kernel when
+    Numba is available.
+    """
+    cells = lattice_cells(system)
+    if tridium_frontier_applies(system):
+        return "tridium", f"Tridium layout with {len(system.expansions)} IO module types ({cells} cells)"
+    if trane_top_vectors_applies(system):
+        return "trane", f"XM30/XM32 separable once XM90 is fixed ({cells} cells)"
+    return lattice_engine(cells)
+
+def lattice_engine(cells):
+    """(name, reason) of the enumerating engine for a lattice of cells count vectors."""
+    if cells <= SMALL_LATTICE:
+        return "reference", f"{cells} cells, at most {SMALL_LATTICE}"
+    import jit_kernel
+
+    if jit_kernel.compiled() is not None:
+        return "jit", f"{cells} cells, Numba available"
+    return "vectorized", f"{cells} cells, Numba not installed"
+
+def _auto_engine(system, stats=None):
+    name, reason = select_engine(system)
+    logger.info("%s: %s engine, %s", system.system_controller.name, name, reason)
+    if stats is not None:
+        stats.engine = name
+        stats.engine_reason = reason
+    return ENGINES[name](system, stats)
+
+register_engine("auto", _auto_engine)
+
+# Debugging override: every run_calculations call uses this engine instead of
+# the one asked for. Set from the CALC_ENGINE environment variable, e.g.
+# CALC_ENGINE=reference python gui.py.
+FORCED_ENGINE = os.environ.get("CALC_ENGINE") or None
+
+# Optional persistent result store (result_cache.ResultCache), consulted by
+# run_calculations before solving. None disables caching.
+RESULT_CACHE = None
+
+def enable_result_cache(path=None, max_entries=20000):
+    """Open (or create) the on-disk result cache and use it for every calculation."""
+    global RESULT_CACHE
+    from result_cache import ResultCache
+
+    RESULT_CACHE = ResultCache(path, max_entries=max_entries)
+    return RESULT_CACHE
+
 def run_calculations(
     system_points,
     system_controller,
@@ -347,21 +1318,87 @@ def run_calculations(
     include_pm014,
     trane_multiplier=1.0,
     tridium_multiplier=1.0,
+    with_stats=False,
+    engine="auto",
 ):
+    """Return the ranked combinations frame, or (frame, CalcStats) with with_stats=True.
+
+    engine names an entry of ENGINES; FORCED_ENGINE, when set, replaces it.
+    """
+    if FORCED_ENGINE and FORCED_ENGINE != engine:
+        logger.info("%s: %s engine forced instead of %s", system_controller.name, FORCED_ENGINE, engine)
+        engine = FORCED_ENGINE
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine {engine!r}; available: {', '.join(ENGINES)}")
     brand_multipliers = {
         "Trane": float(trane_multiplier),
         "Tridium": float(tridium_multiplier),
     }
-    return System(
+    stats = CalcStats() if with_stats else None
+    system = System(
         system_points,
         system_controller,
         expansions_list,
         pm014,
         include_pm014,
         brand_multipliers=brand_multipliers,
-    ).find_combinations()
+    )
+    cache = RESULT_CACHE
+    key = None
+    if cache is not None:
+        start = time.perf_counter()
+        key = cache.key(system_points, system_controller, expansions_list, pm014, include_pm014, brand_multipliers)
+        results = cache.get(key)
+        if stats is not None:
+            stats.add_time("cache", time.perf_counter() - start)
+        if results is not None:
+            if stats is not None:
+                stats.count("cache_hit")
+                stats.count("results", len(results))
+            return (results, stats) if with_stats else results
+    results = ENGINES[engine](system, stats)
+    if key is not None:
+        cache.put(key, results)
+    if with_stats:
+        return results, stats
+    return results
 
-def run_building_calculations(
+def building_row(
+    system_name,
+    system_points,
+    system_controller,
+    expansions_list,
+    pm014,
+    include_pm014,
+    trane_multiplier=1.0,
+    tridium_multiplier=1.0,
+):
+    """Solve one system and return [system name] + its cheapest EXPECTED_COLUMNS row."""
+    results = run_calculations(
+        system_points,
+        system_controller,
+        expansions_list,
+        pm014,
+        include_pm014,
+        trane_multiplier=trane_multiplier,
+        tridium_multiplier=tridium_multiplier,
+    )
+    if results.empty:
+        raise ValueError(f"{system_name}: no combination of the selected modules covers its points")
+    results.reset_index(inplace=True, drop=True)
+    row_result = [
+        float(v) if col in ("Price", "Width") else int(v)
+        for col, v in zip(EXPECTED_COLUMNS, results.iloc[0].tolist())
+    ]
+    row_result.insert(0, system_name)
+    return row_result
+
+def _building_row_task(args):
+    # Module-level so ProcessPoolExecutor can pickle it.
+    system_name, system_points, options = args
+    return building_row(system_name, system_points, **options)
+
+def iter_building_calculations(
     building_df,
     system_controller,
     expansions_list,
@@ -370,31 +1407,383 @@ def run_building_calculations(
     spare_points,
     trane_multiplier=1.0,
     tridium_multiplier=1.0,
+    workers=1,
 ):
+    """Yield the cheapest result row for each system, in input order, as soon as it is solved.
+
+    Each row is [system name] + values for EXPECTED_COLUMNS. With workers > 1
+    the systems are solved in that many processes.
+    """
     building_df.columns = ["System Name", "BO", "BI", "UI", "AO", "AI", "PRESSURE"]
     for col in ["BO", "BI", "UI", "AO", "AI", "PRESSURE"]:
         building_df[col] = building_df[col].apply(lambda x: math.ceil(x * (1 + spare_points / 100)))
-    results_list = []
-    for row in building_df.itertuples(index=False):
-        system_points = {"BO": row[1], "BI": row[2], "UI": row[3], "AO": row[4], "AI": row[5], "PRESSURE": row[6]}
-        results = run_calculations(
+    options = {
+        "system_controller": system_controller,
+        "expansions_list": expansions_list,
+        "pm014": pm014,
+        "include_pm014": include_pm014,
+        "trane_multiplier": trane_multiplier,
+        "tridium_multiplier": tridium_multiplier,
+    }
+    tasks = (
+        (row[0], {"BO": row[1], "BI": row[2], "UI": row[3], "AO": row[4], "AI": row[5], "PRESSURE": row[6]}, options)
+        for row in building_df.itertuples(index=False)
+    )
+    if workers is None or workers <= 1:
+        for task in tasks:
+            yield _building_row_task(task)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(_building_row_task, tasks, chunksize=8)
+
+def solve_shared(systems):
+    """run_calculations frames for several Systems, enumerating each controller's lattice once.
+
+    Systems on the same controller share one FeasibleSet, whatever their
+    points, enabled expansions, PM014 or multipliers, and are answered by
+    filtering and pricing it. Layouts a closed-form engine handles are solved
+    directly instead, which is cheaper than any enumeration.
+    """
+    frames = [None] * len(systems)
+    groups = {}
+    for i, system in enumerate(systems):
+        if select_engine(system)[0] in ("tridium", "trane"):
+            frames[i] = ENGINES["auto"](system)
+        else:
+            groups.setdefault(spec_key(system.system_controller), []).append(i)
+    for indices in groups.values():
+        feasible = FeasibleSet([systems[i] for i in indices])
+        for i in indices:
+            frames[i] = feasible.solve(systems[i])
+    return frames
+
+def apply_spare(system_points, spare):
+    """system_points with spare percent added to each point type, rounded up (as the GUI does)."""
+    return {k: math.ceil(v * (1 + spare / 100)) for k, v in system_points.items()}
+
+SWEEP_COLUMNS = ["Spare %", "Points", *EXPECTED_COLUMNS, "Note"]
+
+def _sweep_rows(system_name, system_points, spares, options):
+    """[spare, points, *cheapest row, note] per spare for one system.
+
+    The spares are solved together by solve_shared(). Layouts a closed form
+    handles (every layout of the default catalog) are solved by it once per
+    spare, which costs less than one enumeration. Other layouts are
+    enumerated once for all spares: more spare only adds points, so every
+    spare's feasible vectors are a subset of the lowest spare's within the
+    highest spare's search bounds. Spares that exceed the controller's
+    capacity are not solved, as in the GUI.
+    """
+    controller = options["system_controller"]
+    brand_multipliers = {"Trane": float(options["trane_multiplier"]), "Tridium": float(options["tridium_multiplier"])}
+    systems = {}
+    for spare in spares:
+        points = apply_spare(system_points, spare)
+        if sum(points.values()) <= controller.max_point_capacity:
+            systems[spare] = System(
+                points, controller, options["expansions_list"], options["pm014"], options["include_pm014"],
+                brand_multipliers=brand_multipliers,
+            )
+    frames = dict(zip(systems, solve_shared(list(systems.values()))))
+    rows = []
+    for spare in spares:
+        points = apply_spare(system_points, spare)
+        values, note = [None] * len(EXPECTED_COLUMNS), ""
+        if spare not in systems:
+            note = f"{system_name}: exceeds {controller.name}'s capacity of {controller.max_point_capacity} points"
+        else:
+            results = frames[spare]
+            if results.empty:
+                note = f"{system_name}: no combination of the selected modules covers its points"
+            else:
+                values = results.iloc[0].tolist()
+        rows.append([spare, sum(points.values()), *values, note])
+    return rows
+
+def _sweep_task(args):
+    # Module-level so ProcessPoolExecutor can pickle it.
+    system_name, system_points, spares, options = args
+    return _sweep_rows(system_name, system_points, spares, options)
+
+def run_spare_sweep(
+    system_points,
+    spares,
+    system_controller,
+    expansions_list,
+    pm014,
+    include_pm014,
+    trane_multiplier=1.0,
+    tridium_multiplier=1.0,
+):
+    """Cost-versus-spare table for one system: its cheapest combination at each spare percentage.
+
+    One row per spare in SWEEP_COLUMNS; a spare that cannot be solved has
+    empty values and says why in "Note". Each row matches run_calculations
+    on the spared points; see _sweep_rows() for how the spares share work.
+    """
+    options = {
+        "system_controller": system_controller,
+        "expansions_list": expansions_list,
+        "pm014": pm014,
+        "include_pm014": include_pm014,
+        "trane_multiplier": trane_multiplier,
+        "tridium_multiplier": tridium_multiplier,
+    }
+    return _sweep_frame(_sweep_rows("System", system_points, list(spares), options))
+
+def run_building_spare_sweep(
+    building_df,
+    spares,
+    system_controller,
+    expansions_list,
+    pm014,
+    include_pm014,
+    trane_multiplier=1.0,
+    tridium_multiplier=1.0,
+    workers=1,
+):
+    """Cost-versus-spare table for a building: per spare, the totals of every system's cheapest row.
+
+    building_df is in the iter_building_calculations layout (spare not yet
+    applied). Each system is swept as in run_spare_sweep(), in up to
+    workers processes. A spare at which any system cannot be solved has
+    empty totals and lists those systems in "Note".
+    """
+    spares = list(spares)
+    options = {
+        "system_controller": system_controller,
+        "expansions_list": expansions_list,
+        "pm014": pm014,
+        "include_pm014": include_pm014,
+        "trane_multiplier": trane_multiplier,
+        "tridium_multiplier": tridium_multiplier,
+    }
+    tasks = [
+        (row[0], dict(zip(["BO", "BI", "UI", "AO", "AI", "PRESSURE"], row[1:7])), spares, options)
+        for row in building_df.itertuples(index=False)
+    ]
+    if workers is None or workers <= 1:
+        per_system = [_sweep_task(task) for task in tasks]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            per_system = list(executor.map(_sweep_task, tasks))
+
+    rows = []
+    for position, spare in enumerate(spares):
+        system_rows = [sweep[position] for sweep in per_system]
+        notes = [row[-1] for row in system_rows if row[-1]]
+        points = sum(row[1] for row in system_rows)
+        if notes:
+            totals = [None] * len(EXPECTED_COLUMNS)
+        else:
+            totals = [sum(row[2 + i] for row in system_rows) for i in range(len(EXPECTED_COLUMNS))]
+        rows.append([spare, points, *totals, "; ".join(notes)])
+    return _sweep_frame(rows)
+
+def _sweep_frame(rows, columns=SWEEP_COLUMNS):
+    import pandas as pd
+
+    frame = pd.DataFrame(rows, columns=columns)
+    # Nullable ints, so unsolved spares stay empty without turning counts into floats.
+    count_cols = ["Points"] + [c for c in EXPECTED_COLUMNS if c not in ("Price", "Width")]
+    frame[count_cols] = frame[count_cols].astype("Int64")
+    frame[["Price", "Width"]] = frame[["Price", "Width"]].astype("float64")
+    return frame
+
+SCENARIO_COLUMNS = [
+    "Scenario", "Controller", "Expansions", "Include PM014", "Trane Multiplier", "Tridium Multiplier",
+    "Points", *EXPECTED_COLUMNS, "Price Change", "Note",
+]
+
+def scenario_grid(
+    catalog,
+    controller_names,
+    expansion_subsets,
+    pm014_options=(True,),
+    trane_multipliers=(1.0,),
+    tridium_multipliers=(1.0,),
+):
+    """Every combination of the given options, as scenario dicts for run_scenarios().
+
+    catalog maps product names to Controllers. Expansion subsets are lists
+    of names; a subset is paired only with controllers of its brand (the
+    empty subset with every controller). PM014 is only varied for Trane
+    controllers, and only the controller's own brand multiplier is varied:
+    the other brand's prices are not used, so its axis is reduced to its
+    first value. Order follows the arguments,
+    so the first scenario can serve as the baseline.
+    """
+    scenarios = []
+    seen = set()
+    for name in controller_names:
+        brand = catalog[name].brand
+        brand_names = IO_MODULE_NAMES.get(brand, [])
+        for subset in expansion_subsets:
+            if not set(subset) <= set(brand_names):
+                continue
+            expansions = [exp for exp in brand_names if exp in subset]
+            for include_pm014 in pm014_options:
+                include_pm014 = bool(include_pm014) and brand == "Trane"
+                for trane_multiplier in trane_multipliers if brand == "Trane" else trane_multipliers[:1]:
+                    for tridium_multiplier in tridium_multipliers if brand == "Tridium" else tridium_multipliers[:1]:
+                        scenario = {
+                            "controller": name,
+                            "expansions": expansions,
+                            "include_pm014": include_pm014,
+                            "trane_multiplier": float(trane_multiplier),
+                            "tridium_multiplier": float(tridium_multiplier),
+                        }
+                        key = (name, tuple(expansions), include_pm014, scenario["trane_multiplier"], scenario["tridium_multiplier"])
+                        if key not in seen:
+                            seen.add(key)
+                            scenarios.append(scenario)
+    return scenarios
+
+def scenario_label(scenario):
+    pm014 = " + PM014" if scenario["include_pm014"] else ""
+    return (
+        f"{scenario['controller']} | {'+'.join(scenario['expansions']) or 'no expansions'}{pm014} | "
+        f"Trane x{scenario['trane_multiplier']:g}, Tridium x{scenario['tridium_multiplier']:g}"
+    )
+
+def _scenario_rows(system_name, system_points, scenarios, catalog):
+    """(cheapest row or None, note) per scenario for one system, solved together by solve_shared().
+
+    Scenarios whose products end up at the same unit prices (e.g. a Tridium
+    multiplier on a Trane controller) have the same answer and are solved once.
+    """
+    systems = {}
+    first = {}
+    same_as = {}
+    notes = {}
+    for i, scenario in enumerate(scenarios):
+        controller = catalog[scenario["controller"]]
+        if sum(system_points.values()) > controller.max_point_capacity:
+            notes[i] = f"{system_name}: exceeds {controller.name}'s capacity of {controller.max_point_capacity} points"
+            continue
+        system = System(
             system_points,
-            system_controller,
-            expansions_list,
-            pm014,
-            include_pm014,
-            trane_multiplier=trane_multiplier,
-            tridium_multiplier=tridium_multiplier,
+            controller,
+            [catalog[name] for name in scenario["expansions"]],
+            catalog["PM014"],
+            scenario["include_pm014"],
+            brand_multipliers={"Trane": scenario["trane_multiplier"], "Tridium": scenario["tridium_multiplier"]},
         )
-        results.reset_index(inplace=True, drop=True)
-        row_result = results.iloc[0].tolist()
-        row_result.insert(0, row[0])
-        results_list.append(row_result)
+        key = (controller.name, tuple(scenario["expansions"]), system.include_pm014, tuple(sorted(system.price_cents.items())))
+        same_as[i] = first.setdefault(key, i)
+        if same_as[i] == i:
+            systems[i] = system
+    frames = dict(zip(systems, solve_shared(list(systems.values()))))
+    rows = []
+    for i in range(len(scenarios)):
+        frame = frames.get(same_as.get(i))
+        if frame is not None and not frame.empty:
+            rows.append((frame.iloc[0].tolist(), ""))
+        else:
+            rows.append((None, notes.get(i, f"{system_name}: no combination of the selected modules covers its points")))
+    return rows
+
+def _scenario_task(args):
+    # Module-level so ProcessPoolExecutor can pickle it.
+    return _scenario_rows(*args)
+
+def run_scenarios(building_df, scenarios, catalog, spare_points=0, workers=1):
+    """Comparison table of scenarios for a building: per scenario, the totals of every system's cheapest row.
+
+    scenarios are dicts as made by scenario_grid(); catalog maps product
+    names to Controllers (with the prices to use). building_df is in the
+    iter_building_calculations layout, before spare. Systems are solved in
+    up to workers processes. For each system, the scenarios are solved
+    together by solve_shared(): layouts a closed form handles (every layout
+    of the default catalog) are solved by it per scenario, and the others on
+    one controller share a single enumeration. "Price Change" is relative to the first
+    scenario; a scenario that some system cannot use has empty totals and a
+    Note naming the systems.
+    """
+    scenarios = list(scenarios)
+    tasks = [
+        (
+            row[0],
+            apply_spare(dict(zip(["BO", "BI", "UI", "AO", "AI", "PRESSURE"], row[1:7])), spare_points),
+            scenarios,
+            catalog,
+        )
+        for row in building_df.itertuples(index=False)
+    ]
+    if workers is None or workers <= 1:
+        per_system = [_scenario_task(task) for task in tasks]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            per_system = list(executor.map(_scenario_task, tasks))
+
+    points = sum(sum(task[1].values()) for task in tasks)
+    rows = []
+    for i, scenario in enumerate(scenarios):
+        results = [system_rows[i] for system_rows in per_system]
+        notes = [note for _, note in results if note]
+        if notes:
+            totals = [None] * len(EXPECTED_COLUMNS)
+        else:
+            totals = [sum(values[k] for values, _ in results) for k in range(len(EXPECTED_COLUMNS))]
+        rows.append([
+            scenario_label(scenario),
+            scenario["controller"],
+            "+".join(scenario["expansions"]),
+            scenario["include_pm014"],
+            scenario["trane_multiplier"],
+            scenario["tridium_multiplier"],
+            points,
+            *totals,
+            None,
+            "; ".join(notes),
+        ])
+    frame = _sweep_frame(rows, SCENARIO_COLUMNS)
+    if len(frame):
+        frame["Price Change"] = (frame["Price"] - frame["Price"].iloc[0]).round(2)
+    return frame
+
+def building_results_frame(results_list):
+    """Build the building results table, with a trailing "Total" row, from result rows."""
+    import pandas as pd
 
     columns = ["System Name"] + EXPECTED_COLUMNS
     results_df = pd.DataFrame(results_list, columns=columns)
-    totals = results_df.iloc[:, 1:].sum()
-    totals.loc["System Name"] = "Total"
-    
-    results_df.loc[len(results_df.index)] = totals
+    # Result rows come back as floats; keep module and point counts as integers.
+    count_cols = [c for c in EXPECTED_COLUMNS if c not in ("Price", "Width")]
+    results_df[count_cols] = results_df[count_cols].astype(int)
+    totals = {col: results_df[col].sum() for col in columns[1:]}
+    totals["System Name"] = "Total"
+    # concat keeps each column's dtype, where .loc row assignment would upcast.
+    results_df = pd.concat([results_df, pd.DataFrame([totals], columns=columns)], ignore_index=True)
     return results_df
+
+def run_building_calculations(
+    building_df,
+    system_controller,
+    expansions_list,
+    pm014,
+    include_pm014,
+    spare_points,
+    trane_multiplier=1.0,
+    tridium_multiplier=1.0,
+    workers=1,
+):
+    results_list = list(iter_building_calculations(
+        building_df,
+        system_controller,
+        expansions_list,
+        pm014,
+        include_pm014,
+        spare_points,
+        trane_multiplier=trane_multiplier,
+        tridium_multiplier=tridium_multiplier,
+        workers=workers,
+    ))
+    return building_results_frame(results_list)
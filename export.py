@@ -0,0 +1,51 @@
+import csv
+import math
+
+
+def _cell(value):
+    """Convert a pandas/NumPy scalar to a plain Python value for openpyxl."""
+    if hasattr(value, "item"):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def _chunks(frame, order, chunk_rows):
+    total = len(frame) if order is None else len(order)
+    for start in range(0, total, chunk_rows):
+        if order is None:
+            yield frame.iloc[start:start + chunk_rows]
+        else:
+            yield frame.iloc[order[start:start + chunk_rows]]
+
+
+def write_frame(frame, file_path, columns=None, order=None, chunk_rows=5000):
+    """Write a result frame to .xlsx or .csv without building a second full copy.
+
+    Rows are taken from the typed frame in chunks of chunk_rows (optionally in
+    the positional order given by order) and streamed to the file: a
+    write-only openpyxl workbook for .xlsx, the csv module otherwise.  Numbers
+    stay numbers; columns renames the header positionally.
+    """
+    header = list(columns) if columns is not None else list(frame.columns)
+    header = header[:frame.shape[1]]
+    if file_path.lower().endswith(".xlsx"):
+        from openpyxl import Workbook
+
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet("Results")
+        sheet.append(header)
+        for block in _chunks(frame, order, chunk_rows):
+            for row in block.itertuples(index=False, name=None):
+                sheet.append([_cell(value) for value in row])
+        workbook.save(file_path)
+    else:
+        with open(file_path, "w", newline="", encoding="utf-8") as handle:
+            writer = csv.writer(handle)
+            writer.writerow(header)
+            for block in _chunks(frame, order, chunk_rows):
+                writer.writerows(
+                    [_cell(value) for value in row]
+                    for row in block.itertuples(index=False, name=None)
+                )
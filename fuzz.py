@@ -0,0 +1,261 @@
+"""Differential fuzzing of the solve engines against the reference enumerator.
+
+Every case is generated from its own seed: a controller, a subset of its
+brand's expansions, point counts, PM014 on/off, brand multipliers and
+sometimes a perturbed price list (round prices to force ties, or zero
+prices) or extra module caps. The reference engine (System.find_combinations) and every other
+registered engine solve the case and the frames are compared column by
+column, exactly. The reference output is also checked for invariants that
+hold for any correct engine.
+
+Besides the registered engines, "jit-kernel" runs jit_kernel.top_vectors as
+plain Python, so the kernel behind the "jit" engine is checked even where
+Numba is not installed (where "jit" itself falls back to the NumPy scan).
+
+Within a case every engine solves the same System, and System.solve_vectors
+(a pure function of the vectors) is computed once per distinct vector list,
+so engines that agree on their vectors share one frame build.
+
+    python fuzz.py                         # 2000 cases from seed 0
+    python fuzz.py --cases 20000 --seed 7 --engine NAME
+    python fuzz.py --replay 1234           # re-run one failing case verbosely
+
+Exit code 1 if any case failed; each failure prints the seed to replay.
+"""
+import argparse
+import random
+import sys
+import time
+
+import numpy as np
+
+import core
+import jit_kernel
+
+POINT_KEYS = ["BO", "BI", "UI", "AO", "AI", "PRESSURE"]
+
+
+def generate_case(seed, max_points=160):
+    """Build one random case from seed; the same seed always gives the same case."""
+    rng = random.Random(seed)
+    controllers = core.default_controllers()
+
+    price_mode = rng.choices(["list", "round", "zero"], weights=[75, 20, 5])[0]
+    if price_mode == "round":
+        # Few distinct round prices make equal-price ties likely.
+        for ctrl in controllers.values():
+            ctrl.price = float(rng.choice([0, 500, 900, 1000, 1500, 3000]))
+    elif price_mode == "zero":
+        controllers[rng.choice(list(controllers))].price = 0.0
+
+    controller = controllers[rng.choice(core.ALL_SYSTEM_CONTROLLER_NAMES)]
+    names = core.TRANE_EXPANSION_NAMES if controller.brand == "Trane" else core.TRIDIUM_EXPANSION_NAMES
+    # Module caps are search constraints every engine must honour, so vary them too.
+    if rng.random() < 0.15:
+        controller.max_io_modules = rng.randint(0, 12)
+    if rng.random() < 0.15:
+        controller.module_limits = {name: rng.randint(0, 6) for name in names if rng.random() < 0.5}
+    enabled = [name for name in names if rng.random() < 0.7]
+    if not enabled and rng.random() < 0.8:
+        enabled = [rng.choice(names)]
+
+    # Mostly small systems so thousands of cases run per minute, with a tail of larger ones.
+    limit = min(controller.max_point_capacity, max_points)
+    total = min(limit, int(rng.paretovariate(1.2) * 6) - 6) if limit else 0
+    weights = [rng.random() for _ in POINT_KEYS]
+    points = dict.fromkeys(POINT_KEYS, 0)
+    for _ in range(total):
+        points[rng.choices(POINT_KEYS, weights=weights)[0]] += 1
+    if rng.random() < 0.9:
+        points["PRESSURE"] = min(points["PRESSURE"], controller.PRESSURE)
+
+    multiplier = lambda: rng.choice([1.0, 1.0, 0.85, 1.1, round(rng.uniform(0.5, 2.0), 2)])
+    return {
+        "seed": seed,
+        "controllers": controllers,
+        "controller": controller,
+        "expansions": [controllers[name] for name in enabled],
+        "points": points,
+        "include_pm014": rng.random() < 0.7,
+        "trane_multiplier": multiplier(),
+        "tridium_multiplier": multiplier(),
+        "prices": price_mode,
+    }
+
+
+def describe(case):
+    controller = case["controller"]
+    return (
+        f"seed={case['seed']} controller={controller.name} "
+        f"caps=({controller.max_io_modules}, {controller.module_limits}) "
+        f"expansions={[e.name for e in case['expansions']]} points={case['points']} "
+        f"pm014={case['include_pm014']} multipliers=({case['trane_multiplier']}, {case['tridium_multiplier']}) "
+        f"prices={case['prices']}"
+    )
+
+
+def build_system(case):
+    return core.System(
+        case["points"],
+        case["controller"],
+        case["expansions"],
+        case["controllers"]["PM014"],
+        case["include_pm014"],
+        brand_multipliers={"Trane": case["trane_multiplier"], "Tridium": case["tridium_multiplier"]},
+    )
+
+
+def share_frame_builds(system):
+    """Make system.solve_vectors build each distinct vector list's frame only once."""
+    frames = {}
+    solve_vectors = system.solve_vectors
+
+    def shared(vectors, stats=None):
+        key = tuple(vectors)
+        if key not in frames:
+            frames[key] = solve_vectors(vectors, stats)
+        return frames[key]
+
+    system.solve_vectors = shared
+    return system
+
+
+def _kernel_engine(system, stats=None):
+    # The uncompiled kernel: what "jit" runs once Numba compiles it. Its vectors
+    # must equal the NumPy scan's too, since solve_vectors would hide extra
+    # infeasible ones by validating them.
+    vectors = core.jit_top_vectors(system, kernel=jit_kernel.top_vectors)
+    expected = core.vectorized_top_vectors(system)
+    if vectors != expected:
+        raise AssertionError(f"kernel vectors {vectors[:3]} != vectorized {expected[:3]}")
+    return system.solve_vectors(vectors, stats)
+
+
+# Checked alongside core.ENGINES; not registered there, as it is only slow Python.
+FUZZ_ENGINES = {"jit-kernel": _kernel_engine}
+
+
+def solve(case, engine):
+    return core.run_calculations(
+        case["points"],
+        case["controller"],
+        case["expansions"],
+        case["controllers"]["PM014"],
+        case["include_pm014"],
+        trane_multiplier=case["trane_multiplier"],
+        tridium_multiplier=case["tridium_multiplier"],
+        engine=engine,
+    )
+
+
+def diff_frames(expected, actual, max_rows=3):
+    """Return a list of differences between two result frames (empty when identical)."""
+    problems = []
+    if expected is actual or expected.equals(actual):
+        return problems
+    if list(expected.columns) != list(actual.columns):
+        return [f"columns differ: {list(expected.columns)} != {list(actual.columns)}"]
+    if len(expected) != len(actual):
+        problems.append(f"row count {len(expected)} != {len(actual)}")
+    rows = min(len(expected), len(actual))
+    for col in expected.columns:
+        left = expected[col].iloc[:rows].to_numpy()
+        right = actual[col].iloc[:rows].to_numpy()
+        bad = np.flatnonzero(left != right).tolist()
+        if bad:
+            shown = ", ".join(f"row {i}: {left[i]!r} != {right[i]!r}" for i in bad[:max_rows])
+            problems.append(f"{col}: {len(bad)} rows differ ({shown})")
+    return problems
+
+
+def check_invariants(case, frame, system=None):
+    """Properties every correct result satisfies, independent of any other engine."""
+    problems = []
+    prices = frame["Price"].tolist()
+    if prices != sorted(prices):
+        problems.append("rows are not sorted by Price")
+    system = system or build_system(case)
+    by_name = {exp.name: exp for exp in case["expansions"]}
+    for name in core.ALL_EXPANSION_NAMES:
+        if name not in by_name and frame[name].any():
+            problems.append(f"{name} is used but not enabled")
+    left_cols = [col for col in core.EXPECTED_COLUMNS if col.endswith("Left")]
+    for i, row in enumerate(frame.to_dict("records")):
+        counts = {exp: int(row[exp.name]) for exp in case["expansions"]}
+        if not system.valid_combination(system.get_combination_points(counts)):
+            problems.append(f"row {i} does not cover the requested points")
+            break
+        if any(row[col] < 0 for col in left_cols):
+            problems.append(f"row {i} has negative left points")
+            break
+    return problems
+
+
+def run_case(case, engines, invariants=True):
+    """Return (failures, reference frame) for one case."""
+    failures = []
+    system = share_frame_builds(build_system(case))
+    expected = core.ENGINES["reference"](system)
+    if invariants:
+        failures += [f"reference: {p}" for p in check_invariants(case, expected, system)]
+    solvers = {**core.ENGINES, **FUZZ_ENGINES}
+    for engine in engines:
+        try:
+            actual = solvers[engine](system)
+        except Exception as e:
+            failures.append(f"{engine}: raised {type(e).__name__}: {e}")
+            continue
+        failures += [f"{engine}: {p}" for p in diff_frames(expected, actual)]
+    return failures, expected
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="fuzz.py", description="Check solve engines against the reference.")
+    parser.add_argument("--cases", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0, help="first case seed; case i uses seed + i")
+    parser.add_argument("--engine", action="append", help="engine to check (repeatable; default: all registered)")
+    parser.add_argument("--max-points", type=int, default=160, help="largest point total generated (default: 160)")
+    parser.add_argument("--replay", type=int, metavar="SEED", help="run only this seed and print its details")
+    parser.add_argument("--no-invariants", action="store_true", help="only diff engines, skip reference checks")
+    parser.add_argument("--max-failures", type=int, default=10, help="stop after this many failing cases")
+    args = parser.parse_args(argv)
+
+    available = [*core.ENGINES, *FUZZ_ENGINES]
+    engines = args.engine or [name for name in available if name != "reference"]
+    unknown = [name for name in engines if name not in available]
+    if unknown:
+        parser.error(f"unknown engine(s) {', '.join(unknown)}; available: {', '.join(available)}")
+
+    if args.replay is not None:
+        case = generate_case(args.replay, args.max_points)
+        print(describe(case))
+        failures, expected = run_case(case, engines, not args.no_invariants)
+        print(expected.head(10).to_string())
+        for failure in failures:
+            print(f"  {failure}")
+        return 1 if failures else 0
+
+    print(f"Checking {', '.join(engines) or 'reference invariants only'} on {args.cases} cases from seed {args.seed}")
+    started = time.perf_counter()
+    failed = 0
+    for i in range(args.cases):
+        case = generate_case(args.seed + i, args.max_points)
+        failures, _ = run_case(case, engines, not args.no_invariants)
+        if failures:
+            failed += 1
+            print(f"FAIL {describe(case)}")
+            for failure in failures:
+                print(f"  {failure}")
+            print(f"  replay: python fuzz.py --replay {case['seed']}")
+            if failed >= args.max_failures:
+                print(f"Stopping after {failed} failing cases.")
+                break
+    elapsed = time.perf_counter() - started
+    ran = i + 1 if args.cases else 0
+    rate = ran / elapsed * 60 if elapsed else 0
+    print(f"{ran} cases, {failed} failed, {elapsed:.1f} s ({rate:.0f} cases/min)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,21 +1,58 @@
+import time
+_STARTUP_T0 = time.perf_counter()
+
 import customtkinter as ctk
 import tkinter as tk
 from tkinter import filedialog, ttk, messagebox
-import pandas as pd
-import threading
 import sys, os
 import math
 import webbrowser
-import requests
-from PIL import Image, ImageTk
 import ctypes
 import tkinter.font as tkfont
 import core
 
-from core import Controller, fetch_prices, run_calculations, run_building_calculations
-from updater import check_for_updates 
+# pandas and PIL are heavy to import (especially from the PyInstaller onefile
+# bundle), so they are imported where they are first used instead of here.
+from core import PRICES_URL, apply_prices, default_controllers, fetch_prices, run_calculations, iter_building_calculations, building_results_frame
+from updater import fetch_update_info, prompt_for_update
+from virtual_table import VirtualTable
+from tk_bridge import TkBridge
+from export import write_frame
+from ingest import TEMPLATE_COLUMNS, IngestError, read_systems_file
 from version import __version__, __app_name__
 
+# Cold-start budget from entering gui.py to the first idle main loop on Linux.
+STARTUP_TARGET_SECONDS = 1.5
+
+
+def resource_path(rel_path: str) -> str:
+    base = getattr(sys, "_MEIPASS", os.path.abspath("."))
+    return os.path.join(base, rel_path)
+
+
+class StartupProfiler:
+    """Record wall-clock time spent in each named startup phase."""
+
+    def __init__(self, t0: float):
+        self.t0 = t0
+        self._last = t0
+        self.phases = []
+
+    def mark(self, phase: str):
+        now = time.perf_counter()
+        self.phases.append((phase, now - self._last))
+        self._last = now
+
+    def total(self) -> float:
+        return self._last - self.t0
+
+    def report(self, target: float = STARTUP_TARGET_SECONDS):
+        for phase, seconds in self.phases:
+            print(f"[Startup] {phase:<24} {seconds * 1000:8.1f} ms")
+        total = self.total()
+        verdict = "within" if total <= target else "OVER"
+        print(f"[Startup] {'time to first window':<24} {total * 1000:8.1f} ms ({verdict} {target:.1f} s target)")
+
 # Enable per-monitor DPI awareness before creating the Tk root.
 try:
     ctypes.windll.shcore.SetProcessDpiAwareness(2)  # Per-monitor v2 (Win 8.1+)
@@ -31,7 +68,10 @@ ctk.set_default_color_theme("blue")
 
 class App(ctk.CTk):
     def __init__(self):
+        self.startup = StartupProfiler(_STARTUP_T0)
+        self.startup.mark("imports")
         super().__init__()
+        self.startup.mark("Tk root")
 
         # Scale the UI up slightly on taller displays.
         screen_height = self.winfo_screenheight()
@@ -56,13 +96,19 @@ class App(ctk.CTk):
         self.geometry(f"1300x680")
         self.resizable(True, True)
 
-        try:
-            check_for_updates()
-        except Exception as e:
-            # Update checks are optional and should never block the app.
-            import traceback
-            print("Updater error:", e)
-            traceback.print_exc()
+        # Worker threads hand results back to the Tk thread through this queue.
+        self.bridge = TkBridge(self)
+        self.bridge.start()
+        # Rows per progressive update of the Multiple Systems results.
+        self.multi_result_chunk_rows = 250
+        # Rows inserted into the systems input grid per posted callable; a load
+        # is superseded (and its remaining chunks dropped) when the id changes.
+        self.multi_input_chunk_rows = 200
+        self._systems_load_id = 0
+        self._systems_loading = False
+        # Each Calculate press gets a new id; posts from a superseded run are dropped.
+        self._single_run_id = 0
+        self._multi_run_id = 0
 
         # Controller catalog and pricing state.
         self.controllers = self.initialize_controllers()
@@ -82,6 +128,7 @@ class App(ctk.CTk):
             self.controllers["IO-R-16"],
             self.controllers["IO-R-34"],
         ]
+        self.startup.mark("controller catalog")
 
         # --- zoom setup 🔧 ---
         self.center_locked = True  # keep image centered until user pans/zooms
@@ -107,15 +154,15 @@ class App(ctk.CTk):
         self.zoom_factor = self.zoom_factors["S500"]  # or default controller
         print("Zoom factors:", self.zoom_factors)
 
-        def resource_path(rel_path: str) -> str:
-            base = getattr(sys, "_MEIPASS", os.path.abspath("."))
-            return os.path.join(base, rel_path)
-
         self.zoom_step = 0.2
-        self.original_images = {}
+        # Rendered PhotoImages per (image file, zoom, quality), most recent last;
+        # created with self.assets on first display, see _image_assets.
+        self.render_cache = None
+        self.hq_render_delay_ms = 150
+        self._hq_render_job = None
         
         # Reuse the JACE9000 image for the JACE variants that do not have dedicated assets.
-        image_files = {
+        self.image_files = {
             "S500": "assets/S500_2.png",
             "S800": "assets/S800.png",
             "JACE9000": "assets/Jace9000.png",
@@ -125,13 +172,9 @@ class App(ctk.CTk):
             "JACE9100": "assets/Jace9000.png",
             "JACE9200": "assets/Jace9000.png",
         }
-        
-        for key, image_path in image_files.items():
-            try:
-                self.original_images[key] = Image.open(resource_path(image_path))
-            except FileNotFoundError:
-                print(f"Warning: Image file not found: {image_path}")
-                continue
+        # Each file is decoded once, on first display, and shared by its aliases.
+        self.assets = None
+        self.image_max_size = (screen_width, screen_height)
 
         #--image panning setup 🔧---
         self.pan_start_x = None
@@ -147,17 +190,20 @@ class App(ctk.CTk):
 
         # Tab layout and auto-generated names for new batch rows.
         self._multi_new_row_counter = 1
-        self.tabview = ctk.CTkTabview(self)
+        self.tabview = ctk.CTkTabview(self, command=self._on_tab_change)
         self.tabview.pack(expand=True, fill="both", padx=10, pady=10)
         self.tab_system = self.tabview.add("Single System")
         self.tab_building = self.tabview.add("Multiple Systems")
         self.tab_resources = self.tabview.add("Resources")
         self.tabview.set("Single System")
 
-        # Build the application tabs.
+        # Only the visible tab is built up front; the others are built on first activation.
         self.build_single_system_tab()
-        self.build_multiple_system_tab()
-        self.build_resources_tab()
+        self._pending_tabs = {
+            "Multiple Systems": self.build_multiple_system_tab,
+            "Resources": self.build_resources_tab,
+        }
+        self.startup.mark("Single System tab")
 
         # --- status label ---
         self.status_label = ctk.CTkLabel(self, text="",font=self.font_main)
@@ -167,70 +213,61 @@ class App(ctk.CTk):
         self.version_label = ctk.CTkLabel(self, text=f"Version: {__version__}",font=self.font_main)
         self.version_label.pack(side="left", padx=10, pady=(0,5)) 
 
+        # The first idle callback runs once the main loop has drawn the window.
+        self.after_idle(self._on_startup_idle)
 
+    def _on_startup_idle(self):
+        self.startup.mark("first window")
+        self.startup.report()
+        if "--startup-report" in sys.argv:
+            self.after(0, self.destroy)
+            return
+        if "--no-result-cache" not in sys.argv:
+            try:
+                core.enable_result_cache()
+            except Exception as e:
+                # The cache only saves time; never let it stop the app.
+                print(f"Result cache disabled: {e}")
+        # Network work only starts once the window is up.
+        self.bridge.run_in_background(lambda: fetch_prices(PRICES_URL), self._apply_prices)
+        self.bridge.run_in_background(fetch_update_info, self._on_update_info)
+
+    def _apply_prices(self, prices_df):
+        apply_prices(self.controllers, prices_df)
+        if core.RESULT_CACHE is not None:
+            core.RESULT_CACHE.set_catalog(self.controllers)
+        if core.PRICES_FALLBACK_USED:
+            # Build readable lines like "s500: $1367.00"
+            lines = []
+            for _, row in prices_df.iterrows():
+                name = str(row[0]).strip()
+                price = float(row[2])
+                lines.append(f"{name}: ${price:,.2f}")
+
+            messagebox.showwarning(
+                "Live prices unavailable",
+                "Live price fetch failed, so fallback LIST prices are being used.\n"
+                "Brand multipliers will still be applied to results.\n\n"
+                + "\n".join(lines)
+                + f"\n\nError details:\n{core.PRICES_FETCH_ERROR}"
+            )
 
-    def initialize_controllers(self):
-        s500 = Controller("S500", power_AC=24, width=5.65, AI=5, UI=2, BI=3, BO=9, BIAO=2, PRESSURE=2, max_point_capacity=133, price=1367.00, brand="Trane", max_io_modules=None)
-        s800 = Controller("S800", power_DC=24, width=5.65, max_point_capacity=500, price=4015.00, brand="Trane", max_io_modules=None)
-
-        xm90 = Controller("XM90", power_AC=50, width=8.5, UI=16, UIAO=8, BO=8, price=3379.00, brand="Trane", max_io_modules=None)
-        xm30 = Controller("XM30", power_DC=120, width=2.11, UIAO=4, price=908.00, brand="Trane", max_io_modules=None)
-        xm32 = Controller("XM32", power_DC=100, width=2.82, BO=4, price=908.00, brand="Trane", max_io_modules=None)
-        pm014 = Controller("PM014", power_AC=75, width=5, price=621.00, brand="Trane", max_io_modules=None)
-
-        jace9000 = Controller("JACE9000", power_AC=24, power_DC=24, width=6.74, UI=0, UIAO=0, BO=0, AI=0, BI=0, BIAO=0, PRESSURE=0, max_point_capacity=0, price=4918.55, brand="Tridium", max_io_modules=0)
-        jace9005 = Controller("JACE9005", power_AC=24, power_DC=24, width=6.74, UI=0, UIAO=0, BO=0, AI=0, BI=0, BIAO=0, PRESSURE=0, max_point_capacity=250, price=8037.09, brand="Tridium", max_io_modules=5)
-        jace9010 = Controller("JACE9010", power_AC=24, power_DC=24, width=6.74, UI=0, UIAO=0, BO=0, AI=0, BI=0, BIAO=0, PRESSURE=0, max_point_capacity=500, price=9264.36, brand="Tridium", max_io_modules=16)
-        jace9025 = Controller("JACE9025", power_AC=24, power_DC=24, width=6.74, UI=0, UIAO=0, BO=0, AI=0, BI=0, BIAO=0, PRESSURE=0, max_point_capacity=1250, price=11097.73, brand="Tridium", max_io_modules=16)
-        jace9100 = Controller("JACE9100", power_AC=24, power_DC=24, width=6.74, UI=0, UIAO=0, BO=0, AI=0, BI=0, BIAO=0, PRESSURE=0, max_point_capacity=5000, price=21454.45, brand="Tridium", max_io_modules=16)
-        jace9200 = Controller("JACE9200", power_AC=24, power_DC=24, width=6.74, UI=0, UIAO=0, BO=0, AI=0, BI=0, BIAO=0, PRESSURE=0, max_point_capacity=10000, price=29180.50, brand="Tridium", max_io_modules=16)
-
-        io_r_16 = Controller("IO-R-16", power_AC=2, power_DC=2, width=3.25, UI=8, UIAO=4, BO=4, AI=0, BI=0, BIAO=0, PRESSURE=0, max_point_capacity=16, price=1258.32, brand="Tridium", max_io_modules=None)
-        io_r_34 = Controller("IO-R-34", power_AC=38, power_DC=38, width=6.8, UI=16, UIAO=8, BO=10, AI=0, BI=0, BIAO=0, PRESSURE=0, max_point_capacity=16, price=2800.00, brand="Tridium", max_io_modules=None)
-
-        controllers = {
-            "S500": s500,
-            "S800": s800,
-            "XM90": xm90,
-            "XM30": xm30,
-            "XM32": xm32,
-            "PM014": pm014,
-            "JACE9000": jace9000,
-            "JACE9005": jace9005,
-            "JACE9010": jace9010,
-            "JACE9025": jace9025,
-            "JACE9100": jace9100,
-            "JACE9200": jace9200,
-            "IO-R-16": io_r_16,
-            "IO-R-34": io_r_34,
-        }
+    def _on_update_info(self, info):
+        # Update checks are optional and should never block the app.
+        if info is not None:
+            prompt_for_update(*info, parent=self)
 
-        prices_url = "https://raw.githubusercontent.com/felipeacevedo1014/controller_calculator/refs/heads/main/prices.csv"
-        prices_df = fetch_prices(prices_url)
-        for _, row in prices_df.iterrows():
-            name = str(row[0]).strip().upper()
-            if name in controllers:
-                controllers[name].price = float(row[2])
+    def _on_tab_change(self):
+        builder = self._pending_tabs.pop(self.tabview.get(), None)
+        if builder is not None:
+            t0 = time.perf_counter()
+            builder()
+            print(f"[Startup] built {self.tabview.get()} tab in {(time.perf_counter() - t0) * 1000:.1f} ms")
 
-        return controllers
+    def initialize_controllers(self):
+        # Catalog prices match prices.csv; live prices are applied once the window is up.
+        return default_controllers()
     
-    if core.PRICES_FALLBACK_USED:
-        # Build readable lines like "s500: $1367.00"
-        lines = []
-        for _, row in core.PRICES_USED_DF.iterrows():
-            name = str(row[0]).strip()
-            price = float(row[2])
-            lines.append(f"{name}: ${price:,.2f}")
-
-        messagebox.showwarning(
-            "Live prices unavailable",
-            "Live price fetch failed, so fallback LIST prices are being used.\n"
-            "Brand multipliers will still be applied to results.\n\n"
-            + "\n".join(lines)
-            + f"\n\nError details:\n{core.PRICES_FETCH_ERROR}"
-        )
-
-
     def build_single_system_tab(self):
         frame = ctk.CTkFrame(self.tab_system)
         frame.pack(fill="both", expand=True, padx=10, pady=10)
@@ -383,6 +420,10 @@ class App(ctk.CTk):
         hscroll = ttk.Scrollbar(frame, orient="horizontal", command=self.tree_single.xview)
         self.tree_single.configure(xscrollcommand=hscroll.set)
         hscroll.grid(row=10, column=0, columnspan=5, sticky="ew", padx=5)
+        vscroll = ttk.Scrollbar(frame, orient="vertical")
+        vscroll.grid(row=9, column=5, sticky="ns", pady=5)
+        # Results stay in a DataFrame; only the rows on screen become tree items.
+        self.single_results_view = VirtualTable(self.tree_single, yscrollbar=vscroll, formatter=self._format_result_cell)
         self._update_expansion_visibility()
         self._update_input_field_visibility(self.brand_var.get())
 
@@ -391,14 +432,13 @@ class App(ctk.CTk):
         if self.canvas.winfo_width() < 10 or self.canvas.winfo_height()<10:
             self.after(50, self._wait_for_canvas_ready)
         else:
-            self._update_image_display(self.original_images.get(self.current_controller, self.original_images["S800"]), center_if_needed=True)
+            self._update_image_display(center_if_needed=True)
 
     def _on_controller_select(self, new_ctrl: str):
         self.current_controller = new_ctrl
         self.zoom_factor = self.zoom_factors.get(new_ctrl, self.zoom_factors["S800"])
         self.center_locked = True
-        pil_image = self.original_images.get(new_ctrl, self.original_images["S800"])
-        self._update_image_display(pil_image)
+        self._update_image_display()
         self._update_expansion_visibility()
 
     def _on_brand_change(self, selected_brand: str):
@@ -527,13 +567,52 @@ class App(ctk.CTk):
         # Update treeview columns
         tree_widget["displaycolumns"] = visible_cols
 
-    def _update_image_display(self, pil_image, center_if_needed=True):
-        w, h = pil_image.size
-        new_size = (int(w * self.zoom_factor), int(h * self.zoom_factor))
-        resampling = getattr(Image, "Resampling", None)
-        resample_filter = resampling.LANCZOS if resampling is not None else getattr(Image, "BICUBIC", 3)
-        resized = pil_image.resize(new_size, resample_filter)
-        self.tk_image = ImageTk.PhotoImage(resized)
+    @staticmethod
+    def _format_result_cell(col, val):
+        if col in ("Price", "Width"):
+            return f"{val:.2f}"
+        if col == "System Name":
+            return str(val)
+        # NaN never equals itself; blank cells rather than failing int().
+        return "" if val is None or val != val else str(int(val))
+
+    def _image_assets(self):
+        """The AssetManager and RenderCache, created (and image_cache imported) on first use."""
+        if self.assets is None:
+            from image_cache import AssetManager, RenderCache
+
+            self.assets = AssetManager(
+                self.image_files,
+                resolve=resource_path,
+                max_size=self.image_max_size,
+                fallback="S800",
+            )
+            self.render_cache = RenderCache(max_entries=16)
+        return self.assets, self.render_cache
+
+    def _update_image_display(self, center_if_needed=True, high_quality=True):
+        """Draw the current controller at the current zoom.
+
+        Interactive (low quality) renders come from the nearest pyramid level with
+        a fast filter; a LANCZOS render replaces them once the wheel goes idle.
+        """
+        name = self.current_controller
+        assets, render_cache = self._image_assets()
+        asset_key = assets.key_for(name)
+        key = render_cache.key(asset_key, self.zoom_factor, high_quality)
+        tk_image = render_cache.get(key)
+        if tk_image is None and not high_quality:
+            # A finished high-quality render of this level is better and free.
+            tk_image = render_cache.get(render_cache.key(asset_key, self.zoom_factor, True))
+            high_quality = tk_image is not None
+        if tk_image is None:
+            from PIL import ImageTk
+
+            rendered = assets.pyramid(name).render(self.zoom_factor, high_quality)
+            tk_image = ImageTk.PhotoImage(rendered)
+            render_cache.put(key, tk_image)
+        self.tk_image = tk_image
+        new_size = (tk_image.width(), tk_image.height())
         self.current_drawn_size = new_size  # track for recenter on resize
 
         # Center the image on first load and after a manual reset.
@@ -544,13 +623,26 @@ class App(ctk.CTk):
             self.image_y = (canvas_height - new_size[1]) // 2
             self.center_locked = True
 
-        self.canvas.delete("all")
-        self.canvas_image_id = self.canvas.create_image(
-            self.image_x,
-            self.image_y,
-            anchor="nw",
-            image=self.tk_image
-        )
+        if self.canvas_image_id is None:
+            self.canvas_image_id = self.canvas.create_image(
+                self.image_x,
+                self.image_y,
+                anchor="nw",
+                image=self.tk_image
+            )
+        else:
+            self.canvas.itemconfigure(self.canvas_image_id, image=self.tk_image)
+            self.canvas.coords(self.canvas_image_id, self.image_x, self.image_y)
+
+        if self._hq_render_job is not None:
+            self.after_cancel(self._hq_render_job)
+            self._hq_render_job = None
+        if not high_quality:
+            self._hq_render_job = self.after(self.hq_render_delay_ms, self._render_high_quality)
+
+    def _render_high_quality(self):
+        self._hq_render_job = None
+        self._update_image_display(center_if_needed=False, high_quality=True)
 
     def _on_canvas_resize(self, event=None):
         # Only recenter while the preview is still in auto-center mode.
@@ -584,14 +676,12 @@ class App(ctk.CTk):
         scale = self.zoom_factor / old_zoom
         self.image_x = canvas_mouse_x - rel_x * scale
         self.image_y = canvas_mouse_y - rel_y * scale
-        pil_image = self.original_images.get(self.current_controller, self.original_images["S800"])
-        self._update_image_display(pil_image, center_if_needed=False)  # 🟡 KEY CHANGE
+        self._update_image_display(center_if_needed=False, high_quality=False)  # 🟡 KEY CHANGE
 
     def _reset_zoom(self, event=None):
         self.zoom_factor = self.zoom_factors.get(self.current_controller, self.zoom_factors["S800"])
         self.center_locked = True
-        pil_image = self.original_images.get(self.current_controller, self.original_images["S800"])
-        self._update_image_display(pil_image, center_if_needed=True)
+        self._update_image_display(center_if_needed=True)
 
     def calculate_single(self):
         try:
@@ -628,38 +718,48 @@ class App(ctk.CTk):
             trane_multiplier, tridium_multiplier = self._get_brand_multipliers()
             
             print("Using expansions:", [exp.name for exp in self.expansions])
+            # Read every widget here; the worker thread must not touch Tk.
+            include_pm014 = bool(self.pm014_var.get()) if ctrl.brand == "Trane" else False
+            expansions = list(self.expansions)
 
             def thread_fn():
-                self.status_label.configure(text="Calculating...")
-                include_pm014 = bool(self.pm014_var.get()) if ctrl.brand == "Trane" else False
-                results = run_calculations(
+                results, stats = run_calculations(
                     system_points,
                     ctrl,
-                    self.expansions,
+                    expansions,
                     self.controllers["PM014"],
                     include_pm014,
                     trane_multiplier=trane_multiplier,
                     tridium_multiplier=tridium_multiplier,
+                    with_stats=True,
                 )
                 for col in results.columns:
                     if col not in ("Price", "Width"):
                         results[col] = results[col].astype(int)
-                self.tree_single.delete(*self.tree_single.get_children())
-                
+                return results, stats
+
+            self._single_run_id += 1
+            run_id = self._single_run_id
+
+            def show_results(outcome):
+                if run_id != self._single_run_id:
+                    return
+                results, stats = outcome
+                render_start = time.perf_counter()
                 # Update table columns based on selected brand
                 self._update_results_table_columns(self.tree_single, ctrl.brand)
-                
-                for _, row in results.iterrows():
-                    formatted_row = []
-                    for col, val in row.items():
-                        if col in ("Price", "Width"):
-                            formatted_row.append(f"{val:.2f}")
-                        else:
-                            formatted_row.append(f"{int(val)}")
-                    self.tree_single.insert("", "end", values=formatted_row)
-                self.status_label.configure(text="Done.")
-   
-            threading.Thread(target=thread_fn, daemon=True).start()
+                self.single_results_view.set_frame(results)
+                stats.add_time("render", time.perf_counter() - render_start)
+                self.status_label.configure(text=f"Done. {stats.summary()}")
+
+            def show_error(e):
+                if run_id != self._single_run_id:
+                    return
+                self.status_label.configure(text="")
+                messagebox.showerror("Error", f"Calculation failed {e}")
+
+            self.status_label.configure(text="Calculating...")
+            self.bridge.run_in_background(thread_fn, show_results, show_error)
 
 
         except Exception as e:
@@ -691,18 +791,35 @@ class App(ctk.CTk):
         )
 
         if file_path:
-            data = [self.tree_single.item(i)['values'] for i in self.tree_single.get_children()]
-            df = pd.DataFrame(data, columns=self.tree_single["columns"])
+            self._export_results(
+                self.single_results_view, file_path, f"Results saved to {os.path.basename(file_path)}"
+            )
 
-            try:
-                if file_path.endswith(".xlsx"):
-                    df.to_excel(file_path, index=False)
-                else:
-                    df.to_csv(file_path, index=False)
-                messagebox.showinfo("Saved", f"Results saved to {os.path.basename(file_path)}")
-            except Exception as e:
-                messagebox.showerror("Error", f"Could not save file:\n{e}")
 
+    def _export_results(self, view, file_path, saved_message):
+        """Stream a results view's typed frame to disk, in the order shown on screen.
+
+        The write runs in a worker thread; the frame is never mutated in place
+        (new results replace it), so the snapshot taken here stays consistent.
+        """
+        import pandas as pd
+
+        columns = view.columns
+        frame = view.frame if view.frame is not None else pd.DataFrame(columns=columns)
+        order = view.view_order() if view.frame is not None else None
+
+        def on_done(_):
+            self.status_label.configure(text="")
+            messagebox.showinfo("Saved", saved_message)
+
+        def on_error(e):
+            self.status_label.configure(text="")
+            messagebox.showerror("Error", f"Could not save file:\n{e}")
+
+        self.status_label.configure(text="Saving...")
+        self.bridge.run_in_background(
+            lambda: write_frame(frame, file_path, columns=columns, order=order), on_done, on_error
+        )
 
     def build_multiple_system_tab(self):
         frame = ctk.CTkFrame(self.tab_building)
@@ -814,8 +931,10 @@ class App(ctk.CTk):
         self.table_hint_label.pack(pady=(2, 2))
 
         # === Output table ===
+        result_frame = ctk.CTkFrame(frame, fg_color="transparent")
+        result_frame.pack(fill="both", expand=True, pady=10, padx=1)
         self.multi_result_table = ttk.Treeview(
-            frame,
+            result_frame,
             columns=(
                 "System",
                 "S500","S800","JACE9000","JACE9005","JACE9010","JACE9025","JACE9100","JACE9200",
@@ -834,7 +953,13 @@ class App(ctk.CTk):
             self.multi_result_table.heading(col, text=col)
             w = COUNT_W if col in count_cols else OTHER_W
             self.multi_result_table.column(col, width=w, anchor="center")
-        self.multi_result_table.pack(fill="both", expand=True, pady=10, padx=1)
+        self.multi_result_table.pack(side="left", fill="both", expand=True)
+        multi_vscroll = ttk.Scrollbar(result_frame, orient="vertical")
+        multi_vscroll.pack(side="right", fill="y")
+        # The last results row is the building total, so it stays pinned below the sorted rows.
+        self.multi_results_view = VirtualTable(
+            self.multi_result_table, yscrollbar=multi_vscroll, formatter=self._format_result_cell, pinned_rows=1
+        )
   
 
         # === Save button ===
@@ -847,7 +972,7 @@ class App(ctk.CTk):
     def download_template(self):
         """Create and save a Multiple Systems input template (Excel or CSV)."""
         # Must match your loader & table order
-        columns = ["System", "BO", "BI", "UI", "AO", "AI", "PRESSURE"]
+        columns = TEMPLATE_COLUMNS
         file_path = filedialog.asksaveasfilename(
             title="Save Template",
             defaultextension=".xlsx",
@@ -856,6 +981,8 @@ class App(ctk.CTk):
         if not file_path:
             return
         try:
+            import pandas as pd
+
             df = pd.DataFrame(columns=columns)
             # Optional sample row:
             # df.loc[0] = ["AHU-1", 0, 0, 0, 0, 0, 0]
@@ -876,131 +1003,180 @@ class App(ctk.CTk):
         if not file_path:
             return
 
-        try:
-            if file_path.endswith(".csv"):
-                df = pd.read_csv(file_path)
-            else:
-                df = pd.read_excel(file_path)
-
-            # Normalize headers so CSV and Excel imports are treated the same way.
-            df.columns = [col.strip().lower() for col in df.columns]
+        def read_rows():
+            # Reading, validation and row conversion run off the Tk thread.
+            return list(read_systems_file(file_path).itertuples(index=False, name=None))
 
-            # Define required lowercase columns
-            required_cols = ["system", "bo", "bi", "ui", "ao", "ai", "pressure"]
-            for col in required_cols:
-                if col not in df.columns:
-                    messagebox.showerror("Error", f"Missing column: {col.upper()}")
-                    return
-
-            # Clear previous entries
+        def show_systems(rows):
+            # Clear previous entries, then insert in chunks (original order) so a
+            # large takeoff never holds the Tk thread for more than one chunk.
             self.multi_input_table.delete(*self.multi_input_table.get_children())
+            self._systems_load_id += 1
+            self._systems_loading = True
+            step = self.multi_input_chunk_rows
+            for start in range(0, len(rows), step):
+                chunk = rows[start:start + step]
+                self.bridge.post(insert_systems, self._systems_load_id, chunk, start + len(chunk), len(rows))
+            self.bridge.post(finish_systems, self._systems_load_id, len(rows))
+
+        def insert_systems(load_id, chunk, loaded, total):
+            if load_id != self._systems_load_id:
+                return
+            insert = self.multi_input_table.insert
+            for values in chunk:
+                insert("", "end", values=values)
+            self.status_label.configure(text=f"Loading... {loaded}/{total}")
+
+        def finish_systems(load_id, total):
+            if load_id != self._systems_load_id:
+                return
+            self._systems_loading = False
+            self.status_label.configure(text=f"Loaded {total} systems.")
 
-            # Populate the table (preserve original order)
-            for _, row in df.iterrows():
-                values = [row.get(col, 0) for col in required_cols]
-                self.multi_input_table.insert("", "end", values=values)
+        def show_error(e):
+            self.status_label.configure(text="")
+            if isinstance(e, IngestError):
+                messagebox.showerror("Error", f"Could not load {os.path.basename(file_path)}:\n\n{e}")
+            else:
+                messagebox.showerror("Error", f"Failed to load file:\n{e}")
 
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load file:\n{e}")
+        # Large takeoffs take a while to read and insert.
+        self.status_label.configure(text="Loading...")
+        self.bridge.run_in_background(read_rows, show_systems, show_error)
 
     
     def calculate_multiple(self):
+        import pandas as pd
+
         try:
             trane_multiplier, tridium_multiplier = self._get_brand_multipliers()
         except ValueError as e:
             messagebox.showerror("Error", str(e))
             return
 
-        def thread_fn():
-            try:
-                self.status_label.configure(text="Calculating...")
-                # 1) Gather table rows
-                rows = []
-                for item in self.multi_input_table.get_children():
-                    values = self.multi_input_table.item(item)['values']
-                    rows.append(values)
-                if not rows:
-                    messagebox.showwarning("No Data", "Please load or enter at least one system.")
-                    return
+        if self._systems_loading:
+            messagebox.showinfo("Loading", "Systems are still being loaded; try again when loading is done.")
+            return
 
-                df = pd.DataFrame(rows, columns=["System Name", "BO", "BI", "UI", "AO", "AI", "PRESSURE"])
+        # Steps 1-5 read widgets, so they run here on the Tk thread.
+        try:
+            # 1) Gather table rows
+            rows = []
+            for item in self.multi_input_table.get_children():
+                values = self.multi_input_table.item(item)['values']
+                rows.append(values)
+            if not rows:
+                messagebox.showwarning("No Data", "Please load or enter at least one system.")
+                return
 
-                # 2) Validate numeric fields
-                for col in ["BO", "BI", "UI", "AO", "AI", "PRESSURE"]:
-                    df[col] = pd.to_numeric(df[col], errors="raise")
+            df = pd.DataFrame(rows, columns=["System Name", "BO", "BI", "UI", "AO", "AI", "PRESSURE"])
 
-                # 3) Controller & expansions (respect checkboxes and brand compatibility)
-                ctrl = self.controllers[self.multi_controller_choice.get()]
-                selected_expansion_names = self.trane_expansion_names if ctrl.brand == "Trane" else self.tridium_expansion_names
-                expansions = [
-                    self.controllers[name]
-                    for name in selected_expansion_names
-                    if self.multi_exp_vars[name].get()
-                ]
+            # 2) Validate numeric fields
+            for col in ["BO", "BI", "UI", "AO", "AI", "PRESSURE"]:
+                df[col] = pd.to_numeric(df[col], errors="raise")
 
-                # 4) Spare%
-                spare = int(self.multi_spare_spin.get())
+            # 3) Controller & expansions (respect checkboxes and brand compatibility)
+            ctrl = self.controllers[self.multi_controller_choice.get()]
+            selected_expansion_names = self.trane_expansion_names if ctrl.brand == "Trane" else self.tridium_expansion_names
+            expansions = [
+                self.controllers[name]
+                for name in selected_expansion_names
+                if self.multi_exp_vars[name].get()
+            ]
 
-                # 5) Capacity check per system
-                total_points_per_system = df.iloc[:, 1:-1].apply(
-                    lambda col: col.map(lambda x: math.ceil(x * (1 + spare / 100)))
-                )
-                total_points_sum = total_points_per_system.sum(axis=1)
-                controller_limit = ctrl.max_point_capacity
-                exceeded = df["System Name"][total_points_sum > controller_limit].tolist()
-                if exceeded:
-                    messagebox.showwarning(
-                        "Point Capacity Exceeded",
-                        f"The following systems exceed {ctrl.name}'s capacity of {controller_limit} points: " + "".join(exceeded)
-                    )
-                    return
+            # 4) Spare%
+            spare = int(self.multi_spare_spin.get())
 
-                # 6) Run calculation
-                include_pm014 = bool(self.multi_pm014_var.get()) if ctrl.brand == "Trane" else False
-                results_df = run_building_calculations(
-                    df,
-                    ctrl,
-                    expansions,
-                    self.controllers["PM014"],
-                    include_pm014,
-                    spare,
-                    trane_multiplier=trane_multiplier,
-                    tridium_multiplier=tridium_multiplier,
+            # 5) Capacity check per system
+            total_points_per_system = df.iloc[:, 1:-1].apply(
+                lambda col: col.map(lambda x: math.ceil(x * (1 + spare / 100)))
+            )
+            total_points_sum = total_points_per_system.sum(axis=1)
+            controller_limit = ctrl.max_point_capacity
+            exceeded = df["System Name"][total_points_sum > controller_limit].tolist()
+            if exceeded:
+                messagebox.showwarning(
+                    "Point Capacity Exceeded",
+                    f"The following systems exceed {ctrl.name}'s capacity of {controller_limit} points: " + "".join(exceeded)
                 )
+                return
+            include_pm014 = bool(self.multi_pm014_var.get()) if ctrl.brand == "Trane" else False
+        except Exception as e:
+            messagebox.showerror("Error", f"Calculation failed {e}")
+            return
 
-                # 7) Display results
-                self.multi_result_table.delete(*self.multi_result_table.get_children())
-                columns = list(results_df.columns)
-                self.multi_result_table["columns"] = columns
-                
-                # Update table columns based on selected brand
-                self._update_results_table_columns(self.multi_result_table, ctrl.brand)
-
-                count_cols = {"S500","S800","JACE9000","JACE9005","JACE9010","JACE9025","JACE9100","JACE9200","XM90","XM30","XM32","IO-R-16","PM014"}
-                COUNT_W = 70
-                OTHER_W = 105
-
-                for col in columns:
-                    self.multi_result_table.heading(col, text=col)
-                    w = COUNT_W if col in count_cols else OTHER_W
-                    self.multi_result_table.column(col, width=w, anchor="center")
-                self.multi_result_table.column("System Name", width=140)
-
-                for _, row in results_df.iterrows():
-                    formatted = []
-                    for col in columns:
-                        val = row[col]
-                        if col in ("Price", "Width"):
-                            formatted.append(f"{val:.2f}")
-                        elif col == "System Name":
-                            formatted.append(str(val))
-                        else:
-                            formatted.append(str(int(val)) if pd.notna(val) else "")
-                    self.multi_result_table.insert("", "end", values=formatted)
-                self.status_label.configure(text="Done.")
-            except Exception as e:
-                messagebox.showerror("Error", f"Calculation failed {e}")
-        threading.Thread(target=thread_fn, daemon=True).start()
+        # 6) Prepare the results table; rows stream in as systems are solved.
+        columns = ["System Name"] + core.EXPECTED_COLUMNS
+        self.multi_result_table["columns"] = columns
+
+        # Update table columns based on selected brand
+        self._update_results_table_columns(self.multi_result_table, ctrl.brand)
+
+        count_cols = {"S500","S800","JACE9000","JACE9005","JACE9010","JACE9025","JACE9100","JACE9200","XM90","XM30","XM32","IO-R-16","PM014"}
+        COUNT_W = 70
+        OTHER_W = 105
+
+        for col in columns:
+            self.multi_result_table.heading(col, text=col)
+            w = COUNT_W if col in count_cols else OTHER_W
+            self.multi_result_table.column(col, width=w, anchor="center")
+        self.multi_result_table.column("System Name", width=140)
+        self.multi_results_view.set_frame(pd.DataFrame(columns=columns), pinned_rows=0)
+        total_systems = len(df)
+        self.status_label.configure(text=f"Calculating... 0/{total_systems}")
+        # A newer Calculate press supersedes this run: its chunks and final
+        # frame are dropped, and the worker stops at the next system.
+        self._multi_run_id += 1
+        run_id = self._multi_run_id
+
+        def show_chunk(chunk, done):
+            if run_id != self._multi_run_id:
+                return
+            self.multi_results_view.append_frame(pd.DataFrame(chunk, columns=columns))
+            self.status_label.configure(text=f"Calculating... {done}/{total_systems}")
+
+        def show_results(results_df):
+            if run_id != self._multi_run_id:
+                return
+            # 7) Final table, with the Total row pinned at the bottom
+            self.multi_results_view.set_frame(results_df, pinned_rows=1)
+            elapsed = time.perf_counter() - calc_start
+            self.status_label.configure(text=f"Done. {total_systems} systems in {elapsed:.2f} s")
+
+        def show_error(e):
+            if run_id != self._multi_run_id:
+                return
+            self.status_label.configure(text="")
+            messagebox.showerror("Error", f"Calculation failed {e}")
+
+        def thread_fn():
+            results_list = []
+            chunk = []
+            last_post = time.perf_counter()
+            for row_result in iter_building_calculations(
+                df,
+                ctrl,
+                expansions,
+                self.controllers["PM014"],
+                include_pm014,
+                spare,
+                trane_multiplier=trane_multiplier,
+                tridium_multiplier=tridium_multiplier,
+            ):
+                if run_id != self._multi_run_id:
+                    return None
+                results_list.append(row_result)
+                chunk.append(row_result)
+                # Post in chunks so each main-loop update stays well inside one frame.
+                now = time.perf_counter()
+                if len(chunk) >= self.multi_result_chunk_rows or now - last_post > 0.1:
+                    self.bridge.post(show_chunk, chunk, len(results_list))
+                    chunk = []
+                    last_post = now
+            return building_results_frame(results_list)
+
+        calc_start = time.perf_counter()
+        self.bridge.run_in_background(thread_fn, show_results, show_error)
 
 
     def edit_cell(self, event):
@@ -1120,6 +1296,9 @@ class App(ctk.CTk):
             return
         if not messagebox.askyesno("Clear All", "Delete ALL rows from the input table?"):
             return
+        # Drop the rest of a file that is still being inserted.
+        self._systems_load_id += 1
+        self._systems_loading = False
         for item in items:
             try:
                 self.multi_input_table.delete(item)
@@ -1128,7 +1307,7 @@ class App(ctk.CTk):
 
     # --- Save results from multiple systems ---
     def save_multi_results(self):
-        if not self.multi_result_table.get_children():
+        if not len(self.multi_results_view):
             messagebox.showwarning("No Results", "No results to save.")
             return
 
@@ -1140,23 +1319,9 @@ class App(ctk.CTk):
         if not file_path:
             return
 
-        # Extract table data
-        data = [
-            self.multi_result_table.item(row)["values"]
-            for row in self.multi_result_table.get_children()
-        ]
-        columns = self.multi_result_table["columns"]
-
-        df = pd.DataFrame(data, columns=columns)
-
-        try:
-            if file_path.endswith(".csv"):
-                df.to_csv(file_path, index=False)
-            else:
-                df.to_excel(file_path, index=False)
-            messagebox.showinfo("Saved", f"Results saved to:\n{os.path.basename(file_path)}")
-        except Exception as e:
-            messagebox.showerror("Error", f"Could not save file:\n{e}")
+        self._export_results(
+            self.multi_results_view, file_path, f"Results saved to:\n{os.path.basename(file_path)}"
+        )
 
     def build_resources_tab(self):
         frame = ctk.CTkFrame(self.tab_resources)
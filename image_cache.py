@@ -0,0 +1,154 @@
+from collections import OrderedDict
+
+# PIL is imported on first decode or resize rather than here, so importing
+# this module adds nothing to startup.
+
+# Filter constants of Pillow releases before Image.Resampling existed.
+_FALLBACK_FILTERS = {"LANCZOS": 1, "BILINEAR": 2}
+
+
+def _resample(name: str):
+    from PIL import Image
+
+    # Pillow >= 9.1 moved the filters under Image.Resampling.
+    resampling = getattr(Image, "Resampling", None)
+    if resampling is not None:
+        return getattr(resampling, name)
+    return getattr(Image, name, _FALLBACK_FILTERS[name])
+
+
+class ImagePyramid:
+    """Progressively halved copies of one image for fast zoomed rendering.
+
+    Level 0 is the source image; every further level is half the size of the
+    previous one and is built lazily the first time a zoom level needs it.
+    Zoom is measured against source_size, which defaults to the image size but
+    can be the original asset size when level 0 was already downsampled.
+    """
+
+    def __init__(self, image, min_side: int = 32, source_size=None):
+        self.source_size = source_size or image.size
+        self.min_side = min_side
+        self.levels = [image]
+
+    def _level_for(self, target_size):
+        """Return the smallest level that is still at least target_size."""
+        level = self.levels[0]
+        index = 0
+        while True:
+            w, h = level.size
+            half = (w // 2, h // 2)
+            if half[0] < max(target_size[0], self.min_side) or half[1] < max(target_size[1], self.min_side):
+                return level
+            index += 1
+            if index == len(self.levels):
+                self.levels.append(level.resize(half, _resample("LANCZOS")))
+            level = self.levels[index]
+
+    def render(self, zoom: float, high_quality: bool = True):
+        """Render the image at zoom relative to the source size.
+
+        Interactive renders resample the nearest pyramid level with a bilinear
+        filter; high-quality renders use LANCZOS from that same level.
+        """
+        w, h = self.source_size
+        size = (max(1, int(w * zoom)), max(1, int(h * zoom)))
+        level = self._level_for(size)
+        if level.size == size:
+            return level
+        return level.resize(size, _resample("LANCZOS") if high_quality else _resample("BILINEAR"))
+
+
+class RenderCache:
+    """Bounded LRU of rendered zoom levels.
+
+    Keys are (image key, zoom, quality) tuples; values are whatever the caller
+    wants to keep around, typically ImageTk.PhotoImage objects ready for the
+    canvas.
+    """
+
+    def __init__(self, max_entries: int = 16):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    @staticmethod
+    def key(image_key, zoom: float, high_quality: bool):
+        # Zoom steps are multiplicative, so round to keep repeated wheel
+        # positions on the same key despite float drift.
+        return (image_key, round(zoom, 4), bool(high_quality))
+
+    def get(self, key):
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+
+class AssetManager:
+    """Decode each image file once, on first use, and share it across aliases.
+
+    Several controllers can point at the same file (all JACE variants use the
+    JACE9000 artwork); they share one decoded image and one pyramid.  Images
+    larger than max_size are downsampled on load, since the canvas can never
+    show more pixels than that.
+    """
+
+    def __init__(self, aliases: dict, resolve=None, max_size=None, fallback=None):
+        self.aliases = dict(aliases)
+        self.resolve = resolve or (lambda path: path)
+        self.max_size = max_size
+        self.fallback = fallback
+        self._pyramids = {}
+
+    def key_for(self, alias: str):
+        """Return the cache key shared by every alias of the same file."""
+        return self.aliases.get(alias, self.aliases.get(self.fallback))
+
+    def _load(self, path: str) -> ImagePyramid:
+        from PIL import Image
+
+        with Image.open(self.resolve(path)) as image:
+            image.load()
+            source_size = image.size
+            if self.max_size is not None:
+                max_w, max_h = self.max_size
+                scale = min(max_w / source_size[0], max_h / source_size[1], 1.0)
+            else:
+                scale = 1.0
+            if scale < 1.0:
+                size = (max(1, int(source_size[0] * scale)), max(1, int(source_size[1] * scale)))
+                decoded = image.resize(size, _resample("LANCZOS"))
+            else:
+                decoded = image.copy()
+        return ImagePyramid(decoded, source_size=source_size)
+
+    def pyramid(self, alias: str) -> ImagePyramid:
+        """Return the pyramid for alias, falling back to the fallback alias."""
+        path = self.key_for(alias)
+        pyramid = self._pyramids.get(path)
+        if pyramid is not None:
+            return pyramid
+        try:
+            if path is None:
+                raise FileNotFoundError(alias)
+            pyramid = self._load(path)
+        except FileNotFoundError:
+            print(f"Warning: Image file not found: {path}")
+            if alias == self.fallback or self.fallback is None:
+                raise
+            pyramid = self.pyramid(self.fallback)
+        self._pyramids[path] = pyramid
+        return pyramid
+
+    def loaded(self):
+        """Paths that have been decoded so far."""
+        return list(self._pyramids)
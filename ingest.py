@@ -0,0 +1,87 @@
+# Reading of Multiple Systems input files (the downloadable template layout).
+
+# Column schema for the template, in table order. Headers are matched
+# case-insensitively and ignoring surrounding whitespace.
+SYSTEM_COLUMN = "System"
+POINT_COLUMNS = ["BO", "BI", "UI", "AO", "AI", "PRESSURE"]
+TEMPLATE_COLUMNS = [SYSTEM_COLUMN] + POINT_COLUMNS
+
+
+class IngestError(ValueError):
+    """A systems file could not be used; the message lists every problem found."""
+
+    def __init__(self, problems, total=None):
+        self.problems = list(problems)
+        self.total = len(self.problems) if total is None else total
+        message = "\n".join(self.problems)
+        if self.total > len(self.problems):
+            message += f"\n... and {self.total - len(self.problems)} more."
+        super().__init__(message)
+
+
+def _excel_engine():
+    # calamine (Rust) is several times faster than openpyxl for reading.
+    try:
+        import python_calamine  # noqa: F401
+        return "calamine"
+    except ImportError:
+        return "openpyxl"
+
+
+def _read_raw(file_path):
+    import pandas as pd
+
+    # Read every cell as text; the schema below decides what is valid.
+    if file_path.lower().endswith(".csv"):
+        return pd.read_csv(file_path, dtype=str, keep_default_na=False, skipinitialspace=True)
+    return pd.read_excel(file_path, dtype=str, engine=_excel_engine(), keep_default_na=False)
+
+
+def read_systems_file(file_path, max_errors=20):
+    """Load and validate a systems CSV/XLSX.
+
+    Returns a DataFrame with TEMPLATE_COLUMNS: System as str, point columns as
+    int64. Blank point cells count as 0 and fully blank rows are dropped.
+    Raises IngestError listing missing columns, or up to max_errors bad cells
+    (non-numeric, negative or fractional point counts, blank system names).
+    """
+    import numpy as np
+    import pandas as pd
+
+    raw = _read_raw(file_path)
+    raw.columns = pd.Index(raw.columns).astype(str).str.strip().str.lower()
+
+    missing = [col for col in TEMPLATE_COLUMNS if col.lower() not in raw.columns]
+    if missing:
+        raise IngestError([f"Missing column: {col.upper()}" for col in missing])
+
+    df = raw[[col.lower() for col in TEMPLATE_COLUMNS]].copy()
+    df.columns = TEMPLATE_COLUMNS
+    df = df.fillna("").astype(str).apply(lambda col: col.str.strip())
+    # Spreadsheets often carry formatted but empty trailing rows. The
+    # original index is kept so problems can quote spreadsheet row numbers.
+    df = df[(df != "").any(axis=1)]
+
+    text = df[POINT_COLUMNS].replace("", "0")
+    numbers = text.apply(pd.to_numeric, errors="coerce")
+    values = numbers.to_numpy(dtype=float)
+    with np.errstate(invalid="ignore"):
+        bad = np.isnan(values) | (values < 0) | (values != np.floor(values))
+    bad_names = (df[SYSTEM_COLUMN] == "").to_numpy()
+
+    if bad.any() or bad_names.any():
+        # Spreadsheet row numbers: header is row 1, data starts at row 2.
+        row_numbers = df.index.to_numpy() + 2
+        problems = [(row, -1, "SYSTEM: name is blank") for row in np.flatnonzero(bad_names)]
+        rows, cols = np.nonzero(bad)
+        problems += [
+            (row, col, f"{POINT_COLUMNS[col]}: '{text.iat[row, col]}' is not a whole number >= 0")
+            for row, col in zip(rows, cols)
+        ]
+        problems.sort()
+        messages = [f"Row {row_numbers[row]}, {message}" for row, _, message in problems[:max_errors]]
+        raise IngestError(messages, total=len(problems))
+
+    result = numbers.astype("int64")
+    result.insert(0, SYSTEM_COLUMN, df[SYSTEM_COLUMN].astype(str))
+    return result.reset_index(drop=True)
@@ -0,0 +1,128 @@
+"""Optional Numba-compiled lattice scan for the "jit" engine.
+
+top_vectors() walks the module-capped lattice as an odometer, keeps the
+slack of the compiled constraints (A @ x - b) as running sums and streams
+feasible vectors into a top-K buffer, all in flat arrays so Numba can
+compile it. compiled() returns the njit version, or None when Numba is not
+installed; core then falls back to the NumPy scan. The function is plain
+Python too, which is how it is checked without Numba (slowly).
+"""
+import numpy as np
+
+_COMPILED = None
+_TRIED = False
+# Cut used before the buffer first fills: every price qualifies.
+NO_CUT = 2 ** 62
+
+
+def top_vectors(uppers, A, b, capped, budget, unit_cents, controller_cents, pm014_cents,
+                pm014_columns, pm014_extra, limit):
+    """Feasible count vectors, in product() order, priced at most the limit-th cheapest.
+
+    uppers, capped (bool) and unit_cents are per enabled module; A is
+    (rules, modules) and b per rule. budget < 0 means no max_io_modules.
+    pm014_columns holds the XM30, XM32 and XM90 positions (-1 when not
+    enabled), or is empty when PM014 is not added; pm014_extra is added to
+    the PM014 quantity (the S800's own supply). Prices are integer cents, as
+    in System.combination_cents, so ties at the cut are all kept.
+    """
+    modules = uppers.shape[0]
+    rules = b.shape[0]
+    counts = np.zeros(modules, dtype=np.int64)
+    slack = np.zeros(rules)
+    for r in range(rules):
+        slack[r] = -b[r]
+    capacity = 4 * limit + 16
+    kept = np.zeros((capacity, modules), dtype=np.int64)
+    prices = np.zeros(capacity, dtype=np.int64)
+    size = 0
+    cut = NO_CUT
+    used = 0
+    while True:
+        feasible = True
+        for r in range(rules):
+            if slack[r] < 0:
+                feasible = False
+                break
+        if feasible:
+            price = 0
+            for i in range(modules):
+                price += unit_cents[i] * counts[i]
+            qty = 0
+            if pm014_columns.shape[0]:
+                modules_xm = 0
+                for position in range(3):
+                    column = pm014_columns[position]
+                    if column >= 0:
+                        modules_xm += counts[column] * (-2 if position == 2 else 1)
+                qty = max(0, -(-(modules_xm - 2) // 11)) + pm014_extra
+            price += controller_cents + pm014_cents * qty
+            if price <= cut:
+                if size == capacity:
+                    size, cut = _compact(kept, prices, size, limit)
+                    if size * 2 > capacity:
+                        capacity *= 2
+                        grown = np.zeros((capacity, modules), dtype=np.int64)
+                        grown[:size] = kept[:size]
+                        kept = grown
+                        grown_prices = np.zeros(capacity, dtype=np.int64)
+                        grown_prices[:size] = prices[:size]
+                        prices = grown_prices
+                if price <= cut:
+                    kept[size] = counts
+                    prices[size] = price
+                    size += 1
+
+        # Advance the odometer: bump the last module that can still grow and
+        # reset the ones after it.
+        i = modules - 1
+        while i >= 0:
+            if counts[i] < uppers[i] and not (capped[i] and budget >= 0 and used >= budget):
+                counts[i] += 1
+                for r in range(rules):
+                    slack[r] += A[r, i]
+                if capped[i]:
+                    used += 1
+                break
+            q = counts[i]
+            if q:
+                for r in range(rules):
+                    slack[r] -= A[r, i] * q
+                if capped[i]:
+                    used -= q
+                counts[i] = 0
+            i -= 1
+        if i < 0:
+            break
+
+    size, cut = _compact(kept, prices, size, limit)
+    return kept[:size].copy()
+
+
+def _compact(kept, prices, size, limit):
+    """Drop rows priced above the limit-th cheapest, keeping order; return (size, cut)."""
+    if size <= limit:
+        return size, NO_CUT
+    cut = np.sort(prices[:size])[limit - 1]
+    out = 0
+    for row in range(size):
+        if prices[row] <= cut:
+            kept[out] = kept[row]
+            prices[out] = prices[row]
+            out += 1
+    return out, cut
+
+
+def compiled():
+    """top_vectors compiled with numba.njit, or None when Numba is not installed."""
+    global _COMPILED, _TRIED, _compact
+    if not _TRIED:
+        _TRIED = True
+        try:
+            import numba
+        except ImportError:
+            return None
+        # top_vectors calls the module-level _compact, so compile that first.
+        _compact = numba.njit(cache=True)(_compact)
+        _COMPILED = numba.njit(cache=True)(top_vectors)
+    return _COMPILED
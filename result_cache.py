@@ -0,0 +1,172 @@
+import hashlib
+import json
+import numbers
+import os
+import sqlite3
+import threading
+import time
+
+# Bump when the engine's output for the same inputs changes, so old entries are dropped.
+CACHE_VERSION = 3
+
+SPEC_FIELDS = (
+    "name", "price", "power_AC", "power_DC", "width", "UI", "UIAO", "BO", "AI", "BI", "BIAO",
+    "PRESSURE", "max_point_capacity", "brand", "max_io_modules", "module_limits",
+)
+
+
+def default_cache_path():
+    """Per-user cache location: %LOCALAPPDATA% on Windows, XDG cache dir elsewhere."""
+    base = os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(base, "controller_calculator", "results.sqlite")
+
+
+def controller_spec(controller):
+    return {field: getattr(controller, field) for field in SPEC_FIELDS}
+
+
+def fingerprint(value) -> str:
+    """sha256 of the canonical JSON form of value."""
+    text = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def catalog_fingerprint(controllers) -> str:
+    """Fingerprint of every product's specs and price (changes when prices.csv or specs do)."""
+    return fingerprint({name: controller_spec(ctrl) for name, ctrl in controllers.items()})
+
+
+class ResultCache:
+    """SQLite store of run_calculations frames, shared across sessions and processes.
+
+    Keys hash the normalized inputs together with the full specs and prices
+    of the controller, expansions and PM014 involved, so a price or spec
+    change can never return a stale frame. set_catalog() additionally drops
+    every entry when the catalog fingerprint changes, so the file does not
+    fill up with unreachable results. The least recently used entries are
+    evicted beyond max_entries.
+    """
+
+    def __init__(self, path=None, max_entries: int = 20000):
+        self.path = path or default_cache_path()
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self.hits = 0
+        self.misses = 0
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connection() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, frame TEXT NOT NULL, used REAL NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS results_used ON results(used)")
+            db.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            row = db.execute("SELECT value FROM meta WHERE name = 'version'").fetchone()
+            if row is None or row[0] != str(CACHE_VERSION):
+                db.execute("DELETE FROM results")
+                db.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (str(CACHE_VERSION),))
+
+    def _connection(self):
+        # sqlite3 connections must not cross threads or forked processes.
+        db = getattr(self._local, "db", None)
+        if db is None or self._local.pid != os.getpid():
+            db = sqlite3.connect(self.path, timeout=5.0)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+            self._local.pid = os.getpid()
+        return db
+
+    @staticmethod
+    def key(system_points, system_controller, expansions_list, pm014, include_pm014, brand_multipliers):
+        return fingerprint({
+            "version": CACHE_VERSION,
+            "points": {k: _exact_count(v) for k, v in system_points.items()},
+            "controller": controller_spec(system_controller),
+            "expansions": [controller_spec(exp) for exp in expansions_list],
+            "pm014": controller_spec(pm014),
+            "include_pm014": bool(include_pm014),
+            "multipliers": {brand: float(m) for brand, m in brand_multipliers.items()},
+        })
+
+    def get(self, key):
+        """Return the cached frame for key, or None."""
+        db = self._connection()
+        row = db.execute("SELECT frame FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        with db:
+            db.execute("UPDATE results SET used = ? WHERE key = ?", (time.time(), key))
+        return _frame_from_json(row[0])
+
+    def put(self, key, frame):
+        db = self._connection()
+        with db:
+            db.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?)", (key, _frame_to_json(frame), time.time())
+            )
+            count = db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+            if count > self.max_entries:
+                # Evict a tenth at a time so eviction is not paid on every insert.
+                excess = count - self.max_entries + self.max_entries // 10
+                db.execute(
+                    "DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY used LIMIT ?)", (excess,)
+                )
+
+    def set_catalog(self, controllers):
+        """Drop all entries if the catalog (prices or specs) changed since the last session."""
+        value = catalog_fingerprint(controllers)
+        db = self._connection()
+        with db:
+            row = db.execute("SELECT value FROM meta WHERE name = 'catalog'").fetchone()
+            if row is not None and row[0] != value:
+                db.execute("DELETE FROM results")
+            db.execute("INSERT OR REPLACE INTO meta VALUES ('catalog', ?)", (value,))
+
+    def clear(self):
+        db = self._connection()
+        with db:
+            db.execute("DELETE FROM results")
+
+    def __len__(self):
+        return self._connection().execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def close(self):
+        db = getattr(self._local, "db", None)
+        if db is not None:
+            db.close()
+            self._local.db = None
+
+
+def _exact_count(value):
+    """value as a plain int or float with nothing dropped: 2.5 stays distinct from 2,
+    and numpy counts key the same as Python ones. Non-numbers are kept as given."""
+    if isinstance(value, numbers.Integral):
+        return int(value)
+    if isinstance(value, numbers.Real):
+        value = float(value)
+        return int(value) if value.is_integer() else value
+    return value
+
+
+def _frame_to_json(frame):
+    records = [[v.item() if hasattr(v, "item") else v for v in row] for row in frame.itertuples(index=False, name=None)]
+    return json.dumps({"columns": list(frame.columns), "data": records})
+
+
+def _frame_from_json(text):
+    import pandas as pd
+
+    payload = json.loads(text)
+    frame = pd.DataFrame(payload["data"], columns=payload["columns"])
+    if len(frame):
+        # Same dtypes as filter_combinations: counts int64, Price/Width float64.
+        count_cols = [c for c in frame.columns if c not in ("Price", "Width")]
+        frame[count_cols] = frame[count_cols].astype("int64")
+        frame[["Price", "Width"]] = frame[["Price", "Width"]].astype("float64")
+    return frame
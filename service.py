@@ -0,0 +1,464 @@
+"""Local HTTP quoting service for the sizing engine.
+
+Keeps a pool of worker processes with pandas imported and the catalog built,
+so a request only pays for the calculation itself, and caches results per
+request. JSON endpoints:
+
+    GET  /health      liveness and pool size
+    GET  /catalog     controllers/expansions with the prices in use
+    GET  /metrics     request counts, cache hit rate, latency percentiles, throughput
+    POST /system      one system -> ranked combinations (run_calculations)
+    POST /building    many systems -> cheapest row per system plus a Total row
+
+Example:
+
+    python service.py --port 8765 --workers 4
+    curl -s localhost:8765/system -d '{"controller": "S500", "points": {"BO": 4, "UI": 8}}'
+
+The server binds to 127.0.0.1 unless --host is given.
+"""
+import argparse
+import json
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import core
+from ingest import POINT_COLUMNS
+
+MAX_BODY_BYTES = 1 << 20
+
+# Catalog of the current worker process, built once by _init_worker.
+_WORKER_CATALOG = None
+
+
+def _catalog_with_prices(prices):
+    controllers = core.default_controllers()
+    for name, price in (prices or {}).items():
+        if name in controllers:
+            controllers[name].price = float(price)
+    return controllers
+
+
+def _init_worker(prices):
+    """Process-pool initializer: import pandas, build the catalog and run one solve."""
+    global _WORKER_CATALOG
+    import pandas  # noqa: F401
+
+    _WORKER_CATALOG = _catalog_with_prices(prices)
+    _solve(("system", {"BO": 1}, _warmup_options()))
+
+
+def _warmup_options():
+    return {
+        "controller": "S500",
+        "expansions": list(core.TRANE_EXPANSION_NAMES),
+        "include_pm014": True,
+        "trane_multiplier": 1.0,
+        "tridium_multiplier": 1.0,
+        "limit": 1,
+    }
+
+
+def _solve(task):
+    """Run one calculation in a worker. Module-level so the pool can pickle it."""
+    kind, payload, options = task
+    controllers = _WORKER_CATALOG
+    controller = controllers[options["controller"]]
+    expansions = [controllers[name] for name in options["expansions"]]
+    if kind == "building":
+        name, points = payload
+        try:
+            row = core.building_row(
+                name,
+                points,
+                controller,
+                expansions,
+                controllers["PM014"],
+                options["include_pm014"],
+                trane_multiplier=options["trane_multiplier"],
+                tridium_multiplier=options["tridium_multiplier"],
+            )
+        except ValueError as e:
+            return {"error": str(e)}
+        return {"row": row}
+
+    results = core.run_calculations(
+        payload,
+        controller,
+        expansions,
+        controllers["PM014"],
+        options["include_pm014"],
+        trane_multiplier=options["trane_multiplier"],
+        tridium_multiplier=options["tridium_multiplier"],
+    )
+    rows = results.head(options["limit"]).to_dict("records")
+    return {"count": len(results), "rows": [{k: _plain(v) for k, v in row.items()} for row in rows]}
+
+
+def _plain(value):
+    return value.item() if hasattr(value, "item") else value
+
+
+class RequestError(ValueError):
+    """A request that the service rejects with HTTP 400."""
+
+
+def _points(raw, spare):
+    if not isinstance(raw, dict):
+        raise RequestError("points must be an object of point counts")
+    unknown = sorted(set(raw) - set(POINT_COLUMNS))
+    if unknown:
+        raise RequestError(f"unknown point types: {', '.join(unknown)}")
+    points = {}
+    for key in POINT_COLUMNS:
+        value = raw.get(key, 0)
+        if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+            raise RequestError(f"{key} must be a whole number >= 0")
+        points[key] = math.ceil(value * (1 + spare / 100))
+    return points
+
+
+class LruCache:
+    """Thread-safe least-recently-used map with hit/miss counters."""
+
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class Metrics:
+    """Request counters and a rolling window of latencies per route."""
+
+    def __init__(self, window: int = 2048):
+        self.started = time.perf_counter()
+        self.window = window
+        self._lock = threading.Lock()
+        self._routes = {}
+        self.in_flight = 0
+
+    def begin(self):
+        with self._lock:
+            self.in_flight += 1
+
+    def record(self, route, seconds, ok):
+        with self._lock:
+            self.in_flight -= 1
+            stats = self._routes.setdefault(
+                route, {"requests": 0, "errors": 0, "latencies": deque(maxlen=self.window)}
+            )
+            stats["requests"] += 1
+            stats["errors"] += 0 if ok else 1
+            stats["latencies"].append(seconds)
+
+    @staticmethod
+    def _percentile(ordered, fraction):
+        if not ordered:
+            return None
+        index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+        return round(ordered[index] * 1000, 3)
+
+    def snapshot(self):
+        with self._lock:
+            uptime = time.perf_counter() - self.started
+            routes = {}
+            total = 0
+            for route, stats in self._routes.items():
+                ordered = sorted(stats["latencies"])
+                total += stats["requests"]
+                routes[route] = {
+                    "requests": stats["requests"],
+                    "errors": stats["errors"],
+                    "latency_ms": {
+                        "p50": self._percentile(ordered, 0.50),
+                        "p95": self._percentile(ordered, 0.95),
+                        "p99": self._percentile(ordered, 0.99),
+                        "max": self._percentile(ordered, 1.0),
+                    },
+                }
+            return {
+                "uptime_s": round(uptime, 3),
+                "requests": total,
+                "throughput_rps": round(total / uptime, 3) if uptime > 0 else 0.0,
+                "in_flight": self.in_flight,
+                "routes": routes,
+            }
+
+
+class QuoteService:
+    """Validate requests, answer from the cache or the warm pool, and keep metrics.
+
+    workers=0 solves in the calling thread (useful for debugging); otherwise
+    a process pool of that size is started and warmed up by start().
+    """
+
+    def __init__(self, workers: int = 2, cache_entries: int = 2048, live_prices: bool = False):
+        self.workers = workers
+        self.catalog = core.default_controllers()
+        if live_prices:
+            core.apply_prices(self.catalog, core.fetch_prices(core.PRICES_URL))
+        self.prices = {name: ctrl.price for name, ctrl in self.catalog.items()}
+        self.cache = LruCache(cache_entries)
+        self.metrics = Metrics()
+        self._executor = None
+
+    def start(self):
+        _init_worker(self.prices)  # in-process path, and a warm parent for workers=0
+        if self.workers > 0:
+            from concurrent.futures import ProcessPoolExecutor
+
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_init_worker, initargs=(self.prices,)
+            )
+            # One task per worker so every process is spawned and initialized now.
+            warm = ("system", {"BO": 1}, _warmup_options())
+            list(self._executor.map(_solve, [warm] * self.workers))
+        return self
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    def _run(self, tasks):
+        """Solve tasks, using the cache; returns results in task order."""
+        keys = [json.dumps(task, sort_keys=True) for task in tasks]
+        results = [self.cache.get(key) for key in keys]
+        missing = [i for i, result in enumerate(results) if result is None]
+        if missing:
+            todo = [tasks[i] for i in missing]
+            if self._executor is None:
+                solved = map(_solve, todo)
+            else:
+                solved = self._executor.map(_solve, todo, chunksize=max(1, len(todo) // (4 * self.workers)))
+            for i, result in zip(missing, solved):
+                self.cache.put(keys[i], result)
+                results[i] = result
+        return results, len(tasks) - len(missing)
+
+    def _options(self, body):
+        controller_name = str(body.get("controller", "S500")).strip().upper()
+        if controller_name not in core.ALL_SYSTEM_CONTROLLER_NAMES:
+            raise RequestError(
+                f"controller must be one of {', '.join(core.ALL_SYSTEM_CONTROLLER_NAMES)}"
+            )
+        controller = self.catalog[controller_name]
+        names = body.get("expansions")
+        if names is not None and not isinstance(names, list):
+            raise RequestError("expansions must be a list of names")
+        try:
+            expansions = core.resolve_expansions(
+                self.catalog, controller, None if names is None else ",".join(map(str, names))
+            )
+        except ValueError as e:
+            raise RequestError(str(e)) from None
+        options = {
+            "controller": controller_name,
+            "expansions": [e.name for e in expansions],
+            "include_pm014": controller.brand == "Trane" and bool(body.get("include_pm014", True)),
+        }
+        for key in ("trane_multiplier", "tridium_multiplier"):
+            value = body.get(key, 1.0)
+            if not isinstance(value, (int, float)) or isinstance(value, bool) or value <= 0:
+                raise RequestError(f"{key} must be a number greater than 0")
+            options[key] = float(value)
+        spare = body.get("spare", 0)
+        if not isinstance(spare, (int, float)) or isinstance(spare, bool) or spare < 0:
+            raise RequestError("spare must be a percentage >= 0")
+        return options, spare, controller
+
+    def _check_capacity(self, controller, name, points):
+        total = sum(points.values())
+        if total > controller.max_point_capacity:
+            raise RequestError(
+                f"{name} needs {total} points; {controller.name} has a point limit of "
+                f"{controller.max_point_capacity}"
+            )
+
+    def quote_system(self, body):
+        options, spare, controller = self._options(body)
+        limit = body.get("limit", 50)
+        if not isinstance(limit, int) or isinstance(limit, bool) or limit < 1:
+            raise RequestError("limit must be a whole number >= 1")
+        options["limit"] = limit
+        points = _points(body.get("points"), spare)
+        self._check_capacity(controller, "System", points)
+        (result,), cached = self._run([("system", points, options)])
+        return {"points": points, "cached": bool(cached), **result}
+
+    def quote_building(self, body):
+        options, spare, controller = self._options(body)
+        systems = body.get("systems")
+        if not isinstance(systems, list) or not systems:
+            raise RequestError("systems must be a non-empty list")
+        tasks = []
+        for index, system in enumerate(systems):
+            if not isinstance(system, dict):
+                raise RequestError(f"systems[{index}] must be an object")
+            name = str(system.get("name", "")).strip()
+            if not name:
+                raise RequestError(f"systems[{index}]: name is blank")
+            points = _points({k: v for k, v in system.items() if k != "name"}, spare)
+            self._check_capacity(controller, name, points)
+            tasks.append(("building", (name, points), options))
+
+        results, cached = self._run(tasks)
+        errors = [result["error"] for result in results if "error" in result]
+        if errors:
+            raise RequestError("; ".join(errors))
+        columns = ["System Name"] + core.EXPECTED_COLUMNS
+        rows = [dict(zip(columns, result["row"])) for result in results]
+        total = {"System Name": "Total"}
+        for col in core.EXPECTED_COLUMNS:
+            total[col] = sum(row[col] for row in rows)
+        total["Price"] = round(total["Price"], 2)
+        total["Width"] = round(total["Width"], 2)
+        return {"rows": rows, "total": total, "cached_systems": cached}
+
+    def catalog_info(self):
+        return {
+            name: {"price": ctrl.price, "brand": ctrl.brand, "max_point_capacity": ctrl.max_point_capacity}
+            for name, ctrl in self.catalog.items()
+        }
+
+
+class QuoteHandler(BaseHTTPRequestHandler):
+    server_version = "ControllerCalculator"
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def service(self) -> QuoteService:
+        return self.server.service
+
+    def do_GET(self):
+        routes = {
+            "/health": lambda: {"status": "ok", "workers": self.service.workers},
+            "/catalog": self.service.catalog_info,
+            "/metrics": self._metrics,
+        }
+        self._dispatch(routes, lambda handler: handler())
+
+    def do_POST(self):
+        routes = {
+            "/system": self.service.quote_system,
+            "/building": self.service.quote_building,
+        }
+        self._dispatch(routes, lambda handler: handler(self._read_json()))
+
+    def _metrics(self):
+        snapshot = self.service.metrics.snapshot()
+        cache = self.service.cache
+        lookups = cache.hits + cache.misses
+        snapshot["cache"] = {
+            "entries": len(cache),
+            "hits": cache.hits,
+            "misses": cache.misses,
+            "hit_rate": round(cache.hits / lookups, 4) if lookups else None,
+        }
+        return snapshot
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_BYTES:
+            raise RequestError(f"request body is larger than {MAX_BODY_BYTES} bytes")
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise RequestError(f"invalid JSON: {e}") from None
+        if not isinstance(body, dict):
+            raise RequestError("request body must be a JSON object")
+        return body
+
+    def _dispatch(self, routes, call):
+        route = self.path.split("?", 1)[0].rstrip("/") or "/"
+        handler = routes.get(route)
+        if handler is None:
+            self._send(404, {"error": f"no route {self.command} {route}"})
+            return
+        metrics = self.service.metrics
+        metrics.begin()
+        start = time.perf_counter()
+        status = 500
+        try:
+            payload = call(handler)
+            status = 200
+        except RequestError as e:
+            payload, status = {"error": str(e)}, 400
+        except Exception as e:
+            payload = {"error": f"{type(e).__name__}: {e}"}
+        elapsed = time.perf_counter() - start
+        metrics.record(route, elapsed, status == 200)
+        if status == 200 and route in ("/system", "/building"):
+            payload["elapsed_ms"] = round(elapsed * 1000, 3)
+        self._send(status, payload)
+
+    def _send(self, status, payload):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def make_server(service: QuoteService, host="127.0.0.1", port=8765, quiet=False):
+    """Bind a threaded HTTP server to a started QuoteService (port 0 picks a free port)."""
+    handler = QuoteHandler
+    if quiet:
+        handler = type("QuietQuoteHandler", (QuoteHandler,), {"log_message": lambda self, *args: None})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.service = service
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="service.py", description="Serve the sizing engine over local HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("-w", "--workers", type=int, default=2, help="worker processes, 0 to solve in-process (default: 2)")
+    parser.add_argument("--cache-entries", type=int, default=2048, help="cached results kept (default: 2048)")
+    parser.add_argument("--live-prices", action="store_true", help="load prices.csv from the repository at startup")
+    parser.add_argument("--quiet", action="store_true", help="do not log each request")
+    args = parser.parse_args(argv)
+
+    service = QuoteService(args.workers, args.cache_entries, args.live_prices).start()
+    server = make_server(service, args.host, args.port, args.quiet)
+    print(f"Serving on http://{args.host}:{server.server_address[1]} with {args.workers} worker(s)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
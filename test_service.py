@@ -0,0 +1,117 @@
+"""End-to-end check of the local quoting service over HTTP on localhost.
+
+Starts QuoteService in-process (workers=0) behind make_server on an
+ephemeral port and exercises every endpoint, including the 400 paths:
+
+    python -m unittest test_service
+"""
+import json
+import threading
+import unittest
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+import core
+import service
+
+
+class ServiceTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.service = service.QuoteService(workers=0).start()
+        cls.server = service.make_server(cls.service, port=0, quiet=True)
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.service.close()
+
+    def request(self, path, body=None, raw=None):
+        """(status, JSON payload) for GET path, or POST when body or raw is given."""
+        data = raw if raw is not None else None if body is None else json.dumps(body).encode("utf-8")
+        try:
+            with urlopen(Request(self.base + path, data=data), timeout=30) as response:
+                return response.status, json.loads(response.read())
+        except HTTPError as e:
+            return e.code, json.loads(e.read())
+
+    def test_health_and_catalog(self):
+        status, payload = self.request("/health")
+        self.assertEqual((status, payload["status"]), (200, "ok"))
+        status, payload = self.request("/catalog")
+        self.assertEqual(status, 200)
+        self.assertEqual(payload["S500"]["brand"], "Trane")
+
+    def test_system_matches_run_calculations(self):
+        points = {"BO": 4, "UI": 8}
+        status, payload = self.request("/system", {"controller": "S500", "points": points, "limit": 3})
+        self.assertEqual(status, 200)
+        catalog = core.default_controllers()
+        expected = core.run_calculations(
+            {key: points.get(key, 0) for key in service.POINT_COLUMNS},
+            catalog["S500"],
+            core.resolve_expansions(catalog, catalog["S500"], None),
+            catalog["PM014"],
+            True,
+        )
+        self.assertEqual(payload["count"], len(expected))
+        self.assertEqual(len(payload["rows"]), min(3, len(expected)))
+        self.assertEqual(payload["rows"][0]["Price"], float(expected["Price"].iloc[0]))
+
+        status, again = self.request("/system", {"controller": "S500", "points": points, "limit": 3})
+        self.assertEqual(status, 200)
+        self.assertTrue(again["cached"])
+        self.assertEqual(again["rows"], payload["rows"])
+
+    def test_building_totals(self):
+        systems = [{"name": "AHU-1", "BO": 4, "UI": 8}, {"name": "AHU-2", "BI": 6, "AO": 3}]
+        status, payload = self.request("/building", {"controller": "JACE9010", "systems": systems, "spare": 10})
+        self.assertEqual(status, 200)
+        self.assertEqual([row["System Name"] for row in payload["rows"]], ["AHU-1", "AHU-2"])
+        self.assertEqual(payload["total"]["Price"], round(sum(row["Price"] for row in payload["rows"]), 2))
+
+    def test_bad_requests(self):
+        cases = [
+            ("/system", {"controller": "S999", "points": {"BO": 1}}, "controller must be one of"),
+            ("/system", {"controller": "S500", "points": {"XX": 1}}, "unknown point types"),
+            ("/system", {"controller": "S500", "points": {"BO": -1}}, "BO must be a whole number"),
+            ("/system", {"controller": "S500", "points": {"UI": 500}}, "point limit"),
+            ("/system", {"controller": "S500", "expansions": ["IO-R-34"], "points": {"BO": 1}}, "cannot be used with"),
+            ("/system", {"controller": "S500", "points": {"BO": 1}, "limit": 0}, "limit must be"),
+            ("/building", {"controller": "S500", "systems": []}, "systems must be a non-empty list"),
+            ("/building", {"controller": "S500", "systems": [{"name": " ", "BO": 1}]}, "name is blank"),
+        ]
+        for path, body, message in cases:
+            with self.subTest(body=body):
+                status, payload = self.request(path, body)
+                self.assertEqual(status, 400)
+                self.assertIn(message, payload["error"])
+        status, payload = self.request("/system", raw=b"{not json")
+        self.assertEqual(status, 400)
+        self.assertIn("invalid JSON", payload["error"])
+        status, payload = self.request("/system", raw=b"[1, 2]")
+        self.assertEqual(status, 400)
+        self.assertIn("JSON object", payload["error"])
+
+    def test_unknown_route(self):
+        status, payload = self.request("/nowhere")
+        self.assertEqual(status, 404)
+
+    def test_metrics(self):
+        self.request("/system", {"controller": "S500", "points": {"BI": 2}})
+        self.request("/system", {"controller": "S999"})
+        status, payload = self.request("/metrics")
+        self.assertEqual(status, 200)
+        route = payload["routes"]["/system"]
+        self.assertGreaterEqual(route["requests"], 2)
+        self.assertGreaterEqual(route["errors"], 1)
+        self.assertIsNotNone(route["latency_ms"]["p95"])
+        self.assertIn("hit_rate", payload["cache"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import queue
+import threading
+import time
+import traceback
+
+
+class TkBridge:
+    """Hand work from background threads to the Tk main loop.
+
+    Tkinter is not thread-safe, so worker threads never touch widgets. They
+    post callables with post(); the main loop drains the queue every
+    interval_ms with after() and stops each drain once budget_ms has elapsed,
+    so a burst of results is spread across frames instead of freezing one.
+    The budget is checked between callables, so each one must itself be
+    short: post large updates as several bounded callables (VirtualTable
+    appends cost only the rows appended) rather than as one.
+    """
+
+    def __init__(self, widget, budget_ms: float = 12.0, interval_ms: int = 16):
+        self.widget = widget
+        self.budget = budget_ms / 1000.0
+        self.interval_ms = interval_ms
+        self._queue = queue.Queue()
+        self._job = None
+
+    def start(self):
+        if self._job is None:
+            self._job = self.widget.after(self.interval_ms, self._drain)
+
+    def stop(self):
+        if self._job is not None:
+            self.widget.after_cancel(self._job)
+            self._job = None
+
+    def post(self, fn, *args, **kwargs):
+        """Queue fn(*args, **kwargs) to run on the Tk thread. Safe from any thread."""
+        self._queue.put((fn, args, kwargs))
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def _drain(self):
+        deadline = time.perf_counter() + self.budget
+        while time.perf_counter() < deadline:
+            try:
+                fn, args, kwargs = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                fn(*args, **kwargs)
+            except Exception:
+                traceback.print_exc()
+        self._job = self.widget.after(self.interval_ms, self._drain)
+
+    def run_in_background(self, fn, on_done, on_error=None):
+        """Run fn in a daemon thread; deliver its result (or exception) on the Tk thread."""
+
+        def worker():
+            try:
+                result = fn()
+            except Exception as e:
+                if on_error is not None:
+                    self.post(on_error, e)
+                else:
+                    traceback.print_exc()
+                return
+            self.post(on_done, result)
+
+        thread = threading.Thread(target=worker, daemon=True)
+        thread.start()
+        return thread
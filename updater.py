@@ -1,6 +1,5 @@
 # updater.py — use GitHub latest release tag
 import webbrowser
-import requests
 from packaging.version import Version
 
 OWNER = "felipeacevedo1014"
@@ -15,6 +14,8 @@ def _current_version() -> Version:
     return Version(str(__version__).strip().lstrip("vV"))
 
 def _latest_release_version(token: str | None = None) -> Version:
+    import requests  # deferred: only needed once the check actually runs
+
     headers = {"Accept": "application/vnd.github+json"}
     if token:
         headers["Authorization"] = f"Bearer {token}"
@@ -25,27 +26,46 @@ def _latest_release_version(token: str | None = None) -> Version:
         raise RuntimeError("No tag_name in latest release response")
     return Version(tag.lstrip("vV"))
 
-def check_for_updates():
+def fetch_update_info():
+    """Return (current, latest) versions, or None when the check fails.
+
+    Network only, no UI, so it is safe to call from a background thread.
+    """
     try:
         cur = _current_version()
         latest = _latest_release_version()  # pass GH token here if repo is private
         print(f"[Updater] Current version: {cur}, Latest version: {latest}")
-        if latest > cur:
-            # keep it ultra-simple: ask & open the page
-            try:
-                from tkinter import Tk, messagebox
-                root = Tk(); root.withdraw()
-                if messagebox.askyesno(
-                    "Update Available",
-                    f"A newer version is available.\n\nCurrent: {cur}\nLatest:  {latest}\n\n"
-                    "Open the GitHub Releases page?"
-                ):
-                    webbrowser.open(RELEASES_URL)
-                root.destroy()
-            except Exception:
-                webbrowser.open(RELEASES_URL)
+        return cur, latest
     except Exception as e:
         print(f"[Updater] Failed to check latest release: {e}")
+        return None
+
+def prompt_for_update(cur, latest, parent=None):
+    """Offer to open the releases page when a newer version exists."""
+    if not latest > cur:
+        return
+    # keep it ultra-simple: ask & open the page
+    try:
+        from tkinter import Tk, messagebox
+        root = None
+        if parent is None:
+            root = Tk(); root.withdraw()
+        if messagebox.askyesno(
+            "Update Available",
+            f"A newer version is available.\n\nCurrent: {cur}\nLatest:  {latest}\n\n"
+            "Open the GitHub Releases page?",
+            parent=parent or root,
+        ):
+            webbrowser.open(RELEASES_URL)
+        if root is not None:
+            root.destroy()
+    except Exception:
+        webbrowser.open(RELEASES_URL)
+
+def check_for_updates():
+    info = fetch_update_info()
+    if info is not None:
+        prompt_for_update(*info)
 
 if __name__ == "__main__":
     check_for_updates()
@@ -0,0 +1,255 @@
+from tkinter import ttk
+
+
+def default_formatter(column, value):
+    return "" if value is None else str(value)
+
+
+class VirtualTable:
+    """Show a DataFrame in a ttk.Treeview, materializing only the visible rows.
+
+    The DataFrame stays the model: the tree holds one item per visible row and
+    those items are rewritten as the view scrolls, so scrolling and sorting cost
+    the same for 50 rows as for 500,000.  Frame columns map positionally onto
+    the tree's columns, so headings can differ from the frame's column names.
+    Trailing pinned rows (e.g. a "Total" row) are excluded from sorting and are
+    always shown at the bottom of the view.
+
+    Appended rows are kept as plain tuples and only concatenated onto the
+    DataFrame when the whole frame is needed (frame, sorting), so an append
+    costs O(len(chunk)) however many rows are already shown; rendering reads
+    the visible rows straight from the tuples. While a sort is active, appended rows are listed
+    after the sorted ones until the next sort or set_frame().
+    """
+
+    def __init__(self, tree: ttk.Treeview, yscrollbar=None, formatter=None, pinned_rows=0):
+        self.tree = tree
+        self.yscrollbar = yscrollbar
+        self.formatter = formatter or default_formatter
+        self.pinned_rows = pinned_rows
+        self._frame = None
+        self._pending = []  # appended row tuples not concatenated onto _frame yet
+        self.order = None  # positional row order of the sortable body
+        self.offset = 0
+        self.sort_column = None
+        self.sort_descending = False
+        self._items = []
+        self._headings = {}
+
+        if yscrollbar is not None:
+            yscrollbar.configure(command=self.yview)
+        tree.bind("<Configure>", lambda e: self._render(), add="+")
+        tree.bind("<MouseWheel>", self._on_mousewheel)
+        tree.bind("<Button-4>", lambda e: self._scroll_by(-3))
+        tree.bind("<Button-5>", lambda e: self._scroll_by(3))
+        tree.bind("<Prior>", lambda e: self.yview("scroll", -1, "pages"))
+        tree.bind("<Next>", lambda e: self.yview("scroll", 1, "pages"))
+        tree.bind("<Home>", lambda e: self.yview("moveto", 0))
+        tree.bind("<End>", lambda e: self.yview("moveto", 1))
+        self.refresh_headings()
+
+    # --- model -------------------------------------------------------------
+
+    def set_frame(self, frame, pinned_rows=None):
+        """Replace the model and reset scrolling; the current sort is re-applied."""
+        if pinned_rows is not None:
+            self.pinned_rows = pinned_rows
+        self._frame = frame.reset_index(drop=True)
+        self._pending = []
+        self.offset = 0
+        self.refresh_headings()
+        if self.sort_column is not None and self.sort_column in self.columns:
+            self._apply_sort()
+        else:
+            self.sort_column = None
+            self.order = None
+        self._render()
+
+    def append_frame(self, frame):
+        """Append rows to the model, keeping the scroll position."""
+        if self._frame is None or (self._frame.empty and not self._pending):
+            offset = self.offset
+            self.set_frame(frame)
+            self.offset = offset
+            return
+        self._pending.extend(frame.itertuples(index=False, name=None))
+        if self.pinned_rows:
+            # Pinned rows must stay last, so they cannot wait behind a chunk.
+            self._merge()
+        self._render()
+
+    @property
+    def frame(self):
+        """The whole model as one DataFrame (None when empty), with every appended row."""
+        self._merge()
+        return self._frame
+
+    def _merge(self):
+        if not self._pending:
+            return
+        import pandas as pd
+
+        appended = pd.DataFrame(self._pending, columns=self._frame.columns)
+        self._frame = pd.concat([self._frame, appended], ignore_index=True)
+        self._pending = []
+        if self.sort_column is not None:
+            self._apply_sort()
+
+    def clear(self):
+        self._frame = None
+        self._pending = []
+        self.order = None
+        self.offset = 0
+        self._render()
+
+    def view_order(self):
+        """Frame positions of every row in display order (sorted body, then pinned)."""
+        return self._view_positions(0, self._body_len())
+
+    def _view_positions(self, start, count):
+        """Frame positions for count body rows from start, followed by the pinned rows."""
+        total = len(self)
+        pinned = min(self.pinned_rows, total)
+        body = range(start, start + count)
+        if self.order is not None:
+            # Rows appended since the last sort follow the sorted ones.
+            sorted_rows = len(self.order)
+            body = [int(self.order[i]) if i < sorted_rows else i for i in body]
+        return list(body) + list(range(total - pinned, total))
+
+    def __len__(self):
+        return 0 if self._frame is None else len(self._frame) + len(self._pending)
+
+    @property
+    def columns(self):
+        return list(self.tree["columns"])
+
+    def _body_len(self):
+        return max(0, len(self) - self.pinned_rows)
+
+    # --- sorting -----------------------------------------------------------
+
+    def refresh_headings(self):
+        """Bind sort commands to the tree headings (call after changing columns)."""
+        self._headings = {}
+        for col in self.columns:
+            text = str(self.tree.heading(col, "text") or col)
+            self._headings[col] = text.rstrip(" ▲▼")
+            self.tree.heading(col, command=lambda c=col: self.sort_by(c))
+        self._update_heading_arrows()
+
+    def sort_by(self, column):
+        """Sort by column, toggling the direction on repeated clicks."""
+        if self._frame is None:
+            return
+        self._merge()
+        if self.sort_column == column:
+            self.sort_descending = not self.sort_descending
+        else:
+            self.sort_column = column
+            self.sort_descending = False
+        self._apply_sort()
+        self.offset = 0
+        self._render()
+
+    def _apply_sort(self):
+        position = self.columns.index(self.sort_column)
+        if position >= self._frame.shape[1]:
+            self.order = None
+            return
+        keys = self._frame.iloc[:self._body_len(), position].reset_index(drop=True)
+        self.order = keys.sort_values(
+            ascending=not self.sort_descending, kind="stable", na_position="last"
+        ).index.to_numpy()
+        self._update_heading_arrows()
+
+    def _update_heading_arrows(self):
+        for col, text in self._headings.items():
+            if col == self.sort_column:
+                text = f"{text} {'▼' if self.sort_descending else '▲'}"
+            self.tree.heading(col, text=text)
+
+    # --- scrolling ---------------------------------------------------------
+
+    def _visible_rows(self):
+        style = self.tree.cget("style") or "Treeview"
+        try:
+            row_height = int(ttk.Style().lookup(style, "rowheight") or 20)
+        except (TypeError, ValueError):
+            row_height = 20
+        height = self.tree.winfo_height()
+        if height <= 1:
+            return int(self.tree.cget("height"))
+        # One row's worth of pixels is taken by the heading.
+        return max(1, height // row_height - 1)
+
+    def _max_offset(self, body_rows):
+        return max(0, self._body_len() - body_rows)
+
+    def yview(self, *args):
+        """Scrollbar protocol: ("moveto", fraction) or ("scroll", n, "units"|"pages")."""
+        body_rows = max(1, self._visible_rows() - self.pinned_rows)
+        if not args:
+            return
+        if args[0] == "moveto":
+            self.offset = int(float(args[1]) * self._body_len())
+        elif args[0] == "scroll":
+            step = int(args[1])
+            if len(args) > 2 and args[2] == "pages":
+                step *= body_rows
+            self.offset += step
+        self._render()
+        return "break"
+
+    def _scroll_by(self, rows):
+        self.offset += rows
+        self._render()
+        return "break"
+
+    def _on_mousewheel(self, event):
+        delta = event.delta
+        if abs(delta) >= 120:
+            rows = -3 * int(delta / 120)
+        else:
+            rows = -1 if delta > 0 else 1  # macOS sends small deltas
+        return self._scroll_by(rows)
+
+    # --- rendering ---------------------------------------------------------
+
+    def _rows_at(self, positions):
+        """Value tuples for frame positions, read from _frame or the pending rows."""
+        merged = len(self._frame)
+        rows = [self._pending[position - merged] if position >= merged else None for position in positions]
+        stored = [slot for slot, position in enumerate(positions) if position < merged]
+        if stored:
+            block = self._frame.iloc[[positions[slot] for slot in stored]]
+            for slot, values in zip(stored, block.itertuples(index=False, name=None)):
+                rows[slot] = values
+        return rows
+
+    def _render(self):
+        total = len(self)
+        visible = min(self._visible_rows(), total)
+        pinned = min(self.pinned_rows, total, visible)
+        body_rows = visible - pinned
+        self.offset = max(0, min(self.offset, self._max_offset(body_rows)))
+
+        while len(self._items) < visible:
+            self._items.append(self.tree.insert("", "end", values=()))
+        while len(self._items) > visible:
+            self.tree.delete(self._items.pop())
+
+        if visible:
+            positions = self._view_positions(self.offset, body_rows)[:visible]
+            names = list(self._frame.columns)
+            for item, row in zip(self._items, self._rows_at(positions)):
+                values = [self.formatter(col, val) for col, val in zip(names, row)]
+                self.tree.item(item, values=values)
+
+        if self.yscrollbar is not None:
+            body_total = self._body_len()
+            if body_total and body_rows < body_total:
+                first = self.offset / body_total
+                self.yscrollbar.set(first, (self.offset + body_rows) / body_total)
+            else:
+                self.yscrollbar.set(0.0, 1.0)